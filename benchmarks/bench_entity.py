@@ -0,0 +1,143 @@
+"""Per-poll CPU of writing the states of the sensors of one device.
+
+Compares the entity computing its static attributes in properties on every
+state write with the attributes bound once when the entity is built. Both
+calculate the state Home Assistant writes for every sensor type of one
+device. Run from the repository root:
+
+    python benchmarks/bench_entity.py
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import timeit
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from homeassistant.components.sensor import (  # noqa: E402
+    SensorDeviceClass,
+    SensorStateClass,
+)
+from homeassistant.core import HomeAssistant  # noqa: E402
+from homeassistant.helpers.entity import DeviceInfo  # noqa: E402
+
+from custom_components.mypv.const import DOMAIN, SENSOR_TYPES  # noqa: E402
+from custom_components.mypv.coordinator import MypvDeviceInfo  # noqa: E402
+from custom_components.mypv.sensor import MypvDevice  # noqa: E402
+
+INFO = {"device": "AC-THOR", "sn": "2001002006100019", "fwversion": "a0021700"}
+POLLS = 500
+REPEAT = 40
+
+
+class LegacyMypvDevice(MypvDevice):
+    """The sensor with the properties it had before the attributes were bound."""
+
+    def __init__(self, device, sensor_type, name):
+        """Initialize the sensor and keep what the properties read."""
+        super().__init__(device, sensor_type, name)
+        self._sensor = SENSOR_TYPES[sensor_type].name
+        self._name = name
+        self._unit_of_measurement = SENSOR_TYPES[sensor_type].native_unit_of_measurement
+        self._icon = SENSOR_TYPES[sensor_type].icon
+        self.serial_number = device.info["sn"]
+        self.fwversion = device.info["fwversion"]
+
+    @property
+    def name(self):
+        """Return the name of the sensor."""
+        return f"{self._sensor}"
+
+    @property
+    def unique_id(self):
+        """Return unique id based on device serial and value key."""
+        return "mypv {} {}".format(self.serial_number, self.type)
+
+    @property
+    def state_class(self):
+        """state class"""
+        if self.type == "power":
+            return SensorStateClass.MEASUREMENT
+        return None
+
+    @property
+    def device_class(self):
+        """state class"""
+        if self.type == "power":
+            return SensorDeviceClass.POWER
+        if self.options is not None:
+            return SensorDeviceClass.ENUM
+        return None
+
+    @property
+    def native_unit_of_measurement(self):
+        """Return the unit of measurement this sensor expresses itself in."""
+        return self._unit_of_measurement
+
+    @property
+    def icon(self):
+        """Return icon."""
+        return self._icon
+
+    @property
+    def device_info(self):
+        """Return information about the device."""
+        return DeviceInfo(
+            identifiers={(DOMAIN, self.serial_number)},
+            manufacturer="MYPV",
+            model=self.model,
+            name=self._name,
+            sw_version=self.fwversion,
+            hw_version=None,
+        )
+
+
+def build(hass: HomeAssistant, device: MypvDeviceInfo, cls: type) -> list:
+    """Return a sensor of every type, with the state of the first poll."""
+    entities = []
+    for sensor_type in SENSOR_TYPES:
+        entity = cls(device, sensor_type, "AC-THOR")
+        entity.hass = hass
+        entity.entity_id = f"sensor.mypv_{sensor_type}"
+        entity._attr_native_value = entity.options[0] if entity.options else 1
+        entities.append(entity)
+    return entities
+
+
+def write_states(entities: list) -> None:
+    """Calculate the state every entity writes after a poll."""
+    for entity in entities:
+        entity._async_calculate_state()
+
+
+async def main() -> None:
+    """Print the cost of one poll of both variants."""
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        device = MypvDeviceInfo(hass, "192.0.2.1")
+        device.info = INFO
+        # the entities only read the result of the last poll, which sends
+        # every value, so no sensor writes the cheap unavailable state
+        data = dict.fromkeys(SENSOR_TYPES, 1)
+        coordinator = SimpleNamespace(last_update_success=True, data=data)
+        device.coordinators = dict.fromkeys(("data", "setup", "firmware"), coordinator)
+        variants = {
+            "properties": build(hass, device, LegacyMypvDevice),
+            "_attr_": build(hass, device, MypvDevice),
+        }
+        best = dict.fromkeys(variants, float("inf"))
+        # alternate the variants, a busy machine slows both alike
+        for _ in range(REPEAT):
+            for name, entities in variants.items():
+                elapsed = timeit.timeit(lambda: write_states(entities), number=POLLS)
+                best[name] = min(best[name], elapsed)
+        for name, elapsed in best.items():
+            print(f"{name:10} {elapsed / POLLS * 1e6:8.1f} µs per poll")
+        await hass.async_stop(force=True)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,68 @@
+"""Import time and memory of the state texts.
+
+Compares importing trans.py, which the sensor platform did at module load,
+with loading the catalogue built by scripts/build_catalogue.py. Every
+variant runs in a fresh interpreter after the modules both share are
+imported. Run from the repository root:
+
+    python benchmarks/bench_import.py
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.normpath(os.path.join(os.path.dirname(__file__), ".."))
+RUNS = 7
+
+MEASURE = """
+import json, sys, time, tracemalloc
+sys.path.insert(0, {root!r})
+import homeassistant.components.sensor
+import custom_components.mypv.const
+tracemalloc.start()
+start = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - start
+print(json.dumps([elapsed, tracemalloc.get_traced_memory()[0]]))
+"""
+
+VARIANTS = {
+    "trans.py": "import custom_components.mypv.trans",
+    "catalogue": (
+        "from custom_components.mypv.convert import load_catalogue; load_catalogue()"
+    ),
+    "sensor platform": "import custom_components.mypv.sensor",
+}
+
+
+def measure(statement: str) -> tuple:
+    """Return the best time and the memory of a statement over RUNS runs."""
+    results = []
+    for _ in range(RUNS):
+        output = subprocess.run(
+            [
+                sys.executable,
+                "-W",
+                "ignore",
+                "-c",
+                MEASURE.format(root=ROOT, statement=statement),
+            ],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        results.append(json.loads(output.splitlines()[-1]))
+    return min(elapsed for elapsed, _ in results), results[-1][1]
+
+
+def main() -> None:
+    """Print the cost of every variant."""
+    for name, statement in VARIANTS.items():
+        elapsed, memory = measure(statement)
+        print(f"{name:16} {elapsed * 1000:7.2f} ms {memory / 1024:8.1f} KiB")
+
+
+if __name__ == "__main__":
+    main()
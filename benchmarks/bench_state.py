@@ -0,0 +1,105 @@
+"""Per-poll CPU of building the sensor states of one device.
+
+Compares the conversion the sensor did on every state read with the
+converters resolved once per entity. Run from the repository root:
+
+    python benchmarks/bench_state.py
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from homeassistant.const import (  # noqa: E402
+    UnitOfElectricCurrent,
+    UnitOfFrequency,
+    UnitOfTemperature,
+)
+
+from custom_components.mypv.const import (  # noqa: E402
+    ENUM_SENSORS,
+    MYPV_DEVICES,
+    SENSOR_TYPES,
+)
+from custom_components.mypv.convert import state_converter  # noqa: E402
+from custom_components.mypv.trans import my_pv_trans  # noqa: E402
+
+MODEL = "AC-THOR"
+LANGUAGE = "de"  # the column the sensor always used
+POLLS = 2000
+
+
+def legacy_state(data: dict, sensor_type: str, model: str):
+    """Return the state like MypvDevice.state did before."""
+    unit = SENSOR_TYPES[sensor_type].native_unit_of_measurement
+    state = data[sensor_type]
+    if sensor_type == "power_act":
+        state = int(data["rel1_out"]) * int(data["load_nom"]) + int(state)
+    if state is None:
+        return state
+    if unit == UnitOfFrequency.HERTZ:
+        return state / 1000
+    if unit == UnitOfTemperature.CELSIUS and sensor_type != "tempchip":
+        return state / 10
+    if unit == UnitOfElectricCurrent.AMPERE:
+        return state / 10
+    trans_key = f"info_{sensor_type}_{str(state)}"
+    if "status" == sensor_type:
+        trans_key = f"info_state_{MYPV_DEVICES[model]}_{str(state)}"
+    elif sensor_type in ["m1devstate", "m2devstate", "m3devstate", "m4devstate"]:
+        if state & 1:
+            trans_key = "info_measure_devstate_err1"
+        elif state & 2:
+            trans_key = "info_measure_devstate_err2"
+        elif state & 4:
+            trans_key = "info_measure_devstate_err3"
+        elif state & 8:
+            trans_key = "info_measure_devstate_err4"
+        else:
+            return state
+    if trans_key in my_pv_trans:
+        return str(state) + my_pv_trans[trans_key][0]
+    return state
+
+
+def main() -> None:
+    """Time both variants over every data.jsn sensor."""
+    sensors = [key for key, sensor in SENSOR_TYPES.items() if sensor.source == "data"]
+    data = {key: 2 for key in sensors}
+    data.update(rel1_out=0, load_nom=3000, cloudstate=3, m1devstate=2)
+    converters = [state_converter(sensor, MODEL, LANGUAGE) for sensor in sensors]
+
+    # enum sensors publish the bare code, the frontend translates it
+    before = [
+        legacy_state(data, sensor, MODEL)
+        for sensor in sensors
+        if sensor not in ENUM_SENSORS
+    ]
+    after = [
+        convert(data)
+        for sensor, convert in zip(sensors, converters)
+        if sensor not in ENUM_SENSORS
+    ]
+    assert before == after, "the converters changed a state"
+
+    legacy = timeit.timeit(
+        lambda: [legacy_state(data, sensor, MODEL) for sensor in sensors],
+        number=POLLS,
+    )
+    current = timeit.timeit(
+        lambda: [convert(data) for convert in converters], number=POLLS
+    )
+    setup = timeit.timeit(
+        lambda: [state_converter(sensor, MODEL, LANGUAGE) for sensor in sensors],
+        number=10,
+    )
+    print(f"{len(sensors)} sensors of an {MODEL}, {POLLS} polls")
+    print(f"before: {legacy / POLLS * 1e6:8.1f} us per poll")
+    print(f"after:  {current / POLLS * 1e6:8.1f} us per poll")
+    print(f"converters: {setup / 10 * 1e6:8.1f} us once per device")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 """ Integration for MYPV AC-Thor"""
+import asyncio
 import voluptuous as vol
 import logging
 
@@ -17,9 +18,19 @@ from .const import (
     DOMAIN,
     SENSOR_TYPES,
     DATA_COORDINATOR,
+    DATA_DEVICE,
+    CONF_FIRMWARE_URL,
+    SETUP_TRIGGER_KEYS,
 )
 
-from .coordinator import MYPVDataUpdateCoordinator
+from .coordinator import (
+    MYPVDataUpdateCoordinator,
+    MypvDeviceInfo,
+    MypvFirmwareCoordinator,
+    MypvSetupCoordinator,
+    snapshot_store,
+)
+from .firmware import async_get_firmware_checker
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -28,11 +39,13 @@ CONFIG_SCHEMA = vol.Schema(
     {
         DOMAIN: vol.Schema(
             {
-                vol.Required(CONF_HOST): cv.string,
-                vol.Required(CONF_MONITORED_CONDITIONS): vol.All(
+                # a device is imported if both are given
+                vol.Inclusive(CONF_HOST, "device"): cv.string,
+                vol.Inclusive(CONF_MONITORED_CONDITIONS, "device"): vol.All(
                     cv.ensure_list,
                     [vol.In(list(SENSOR_TYPES))],
                 ),
+                vol.Optional(CONF_FIRMWARE_URL): cv.url,
             }
         )
     },
@@ -47,9 +60,15 @@ async def async_setup(hass, config):
     if DOMAIN not in config:
         return True
 
+    data = dict(config[DOMAIN])
+    # the firmware server is shared by all entries, e.g. a local stand-in
+    async_get_firmware_checker(hass, data.pop(CONF_FIRMWARE_URL, None))
+    if CONF_HOST not in data:
+        return True
+
     hass.async_create_task(
         hass.config_entries.flow.async_init(
-            DOMAIN, context={"source": SOURCE_IMPORT}, data=dict(config[DOMAIN])
+            DOMAIN, context={"source": SOURCE_IMPORT}, data=data
         )
     )
 
@@ -59,26 +78,64 @@ async def async_setup(hass, config):
 async def async_setup_entry(hass: HomeAssistantType, entry: ConfigEntry):
     """Load the saved entities."""
 
+    device = MypvDeviceInfo(hass, entry.data[CONF_HOST], entry.entry_id)
     coordinator = MYPVDataUpdateCoordinator(
         hass,
+        device,
         config=entry.data,
         options=entry.options,
     )
-    await coordinator.async_refresh()
+    # every page is polled at its own cadence and only wakes its own entities
+    setup_coordinator = MypvSetupCoordinator(hass, device)
+    device.coordinators = {
+        "data": coordinator,
+        "setup": setup_coordinator,
+        "firmware": MypvFirmwareCoordinator(hass, device),
+    }
+    # a persisted snapshot creates the entities without waiting on the device
+    restored = await device.async_restore()
+    if not restored:
+        await asyncio.gather(
+            coordinator.async_refresh(), setup_coordinator.async_refresh()
+        )
 
     # Reload entry when its updated.
     entry.async_on_unload(entry.add_update_listener(_async_update_listener))
 
     if not coordinator.last_update_success:
+        await device.async_close()
         raise ConfigEntryNotReady
 
+    if not restored:
+        # the serial number is known now
+        await device.coordinators["firmware"].async_refresh()
+    if entry.unique_id is None and device.serial not in {
+        other.unique_id for other in hass.config_entries.async_entries(DOMAIN)
+    }:
+        # entries created before the flows set the serial as unique id
+        hass.config_entries.async_update_entry(entry, unique_id=device.serial)
+
     hass.data[DOMAIN][entry.entry_id] = {
         DATA_COORDINATOR: coordinator,
+        DATA_DEVICE: device,
     }
 
-    hass.async_create_task(
-        hass.config_entries.async_forward_entry_setup(entry, "sensor")
+    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+
+    # a new operating mode changes the settings, setup.jsn is read again
+    entry.async_on_unload(
+        coordinator.async_add_listener(
+            setup_coordinator.async_mode_changed, frozenset(SETUP_TRIGGER_KEYS)
+        )
     )
+    # the setup changed events fire without any setup sensor monitored
+    entry.async_on_unload(setup_coordinator.async_add_listener(lambda: None))
+
+    if restored:
+        for source, refreshing in device.coordinators.items():
+            entry.async_create_background_task(
+                hass, refreshing.async_refresh(), f"{DOMAIN} {source} {entry.title}"
+            )
 
     return True
 
@@ -86,10 +143,24 @@ async def async_setup_entry(hass: HomeAssistantType, entry: ConfigEntry):
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
-        hass.data[DOMAIN].pop(entry.entry_id)
+        device = hass.data[DOMAIN].pop(entry.entry_id)[DATA_DEVICE]
+        await device.async_close()
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the persisted snapshot of a deleted entry."""
+    await snapshot_store(hass, entry.entry_id).async_remove()
+
+
 async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Handle options update."""
+    entry_data = hass.data[DOMAIN].get(entry.entry_id)
+    if (
+        entry_data is not None
+        and entry.options == entry_data[DATA_COORDINATOR].options
+        and entry.data[CONF_HOST] == entry_data[DATA_COORDINATOR].host
+    ):
+        # the coordinator moved the entry to the new address of the device
+        return
     await hass.config_entries.async_reload(entry.entry_id)
@@ -0,0 +1,160 @@
+"""HTTP transport for the MYPV web server."""
+
+import asyncio
+import logging
+import time
+
+import aiohttp
+
+try:
+    # decodes the response bytes directly and several times faster
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import Event, HomeAssistant, callback
+
+from .const import (
+    DOMAIN,
+    DATA_CONNECTOR,
+    DATA_INFLIGHT,
+    DATA_PROBES,
+    DATA_SESSIONS,
+    HTTP_TIMEOUT,
+    HTTP_KEEPALIVE,
+    HTTP_LIMIT_PER_HOST,
+    PAGE_TIMEOUTS,
+    PROBE_CACHE_TTL,
+)
+from .scheduler import async_get_scheduler
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@callback
+def async_get_session(hass: HomeAssistant, host: str) -> aiohttp.ClientSession:
+    """Return the keep-alive session of a host.
+
+    All sessions share one connector, so every config entry polls over the
+    same connection pool and a poll reuses the socket of the previous one.
+    """
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    sessions = domain_data.setdefault(DATA_SESSIONS, {})
+    session = sessions.get(host)
+    if session is not None and not session.closed:
+        return session
+
+    connector = domain_data.get(DATA_CONNECTOR)
+    if connector is None or connector.closed:
+        connector = aiohttp.TCPConnector(
+            limit_per_host=HTTP_LIMIT_PER_HOST,
+            keepalive_timeout=HTTP_KEEPALIVE,
+        )
+        domain_data[DATA_CONNECTOR] = connector
+
+        async def _async_close_connector(_: Event) -> None:
+            """Close all sessions and the shared connector."""
+            for open_session in domain_data.pop(DATA_SESSIONS, {}).values():
+                await open_session.close()
+            await connector.close()
+
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, _async_close_connector)
+
+    session = aiohttp.ClientSession(
+        connector=connector,
+        connector_owner=False,
+        timeout=aiohttp.ClientTimeout(total=HTTP_TIMEOUT),
+        raise_for_status=True,
+    )
+    sessions[host] = session
+    return session
+
+
+async def async_close_session(hass: HomeAssistant, host: str) -> None:
+    """Close the session of a host, the shared connector stays open."""
+    sessions = hass.data.get(DOMAIN, {}).get(DATA_SESSIONS, {})
+    if (session := sessions.pop(host, None)) is not None:
+        await session.close()
+
+
+@callback
+def async_store_probe(hass: HomeAssistant, host: str, info: dict) -> None:
+    """Keep the mypv_dev.jsn read by the config flow for the coordinator."""
+    probes = hass.data.setdefault(DOMAIN, {}).setdefault(DATA_PROBES, {})
+    probes[host] = (time.monotonic(), info)
+
+
+@callback
+def async_get_probe(hass: HomeAssistant, host: str) -> dict | None:
+    """Return the mypv_dev.jsn of a recent config flow probe of a host."""
+    probe = hass.data.get(DOMAIN, {}).get(DATA_PROBES, {}).get(host)
+    if probe is None or time.monotonic() - probe[0] > PROBE_CACHE_TTL:
+        return None
+    return probe[1]
+
+
+@callback
+def async_pop_probe(hass: HomeAssistant, host: str) -> dict | None:
+    """Return and forget the recent config flow probe of a host."""
+    info = async_get_probe(hass, host)
+    hass.data.get(DOMAIN, {}).get(DATA_PROBES, {}).pop(host, None)
+    return info
+
+
+class MypvApi:
+    """Read the JSON pages of a MYPV device."""
+
+    def __init__(self, hass: HomeAssistant, host: str) -> None:
+        """Initialize the api."""
+        self._hass = hass
+        self.host = host
+        self.joined_requests = 0
+
+    async def async_get_body(self, page: str) -> bytes:
+        """Download the raw body of one page, e.g. data.jsn.
+
+        There is at most one request per host and page in flight, a caller
+        arriving while it runs waits for the same response. The request
+        outlives a caller which gives up, so the next poll can still join it,
+        and raises TimeoutError at the deadline of the page.
+        """
+        inflight = self._hass.data.setdefault(DOMAIN, {}).setdefault(DATA_INFLIGHT, {})
+        key = (self.host, page)
+        task = inflight.get(key)
+        if task is not None:
+            self.joined_requests += 1
+        else:
+            task = self._hass.async_create_background_task(
+                self._async_fetch(page), f"{DOMAIN} {self.host} {page}.jsn"
+            )
+            inflight[key] = task
+
+            def _done(_) -> None:
+                inflight.pop(key, None)
+                if not task.cancelled():
+                    # nobody may be waiting anymore
+                    task.exception()
+
+            task.add_done_callback(_done)
+        return await asyncio.shield(task)
+
+    async def _async_fetch(self, page: str) -> bytes:
+        """Send the request of one page."""
+        session = async_get_session(self._hass, self.host)
+        # waiting for a fleet wide slot isn't a slow device, the page deadline
+        # starts with the request and also frees the slot
+        async with async_get_scheduler(self._hass).async_request():
+            async with asyncio.timeout(PAGE_TIMEOUTS[page]):
+                async with session.get(f"http://{self.host}/{page}.jsn") as response:
+                    return await response.read()
+
+    async def async_get_page(self, page: str) -> dict:
+        """Download and decode one page."""
+        data = json_loads(await self.async_get_body(page))
+        _LOGGER.debug(data)
+        return data
+
+    async def async_close(self) -> None:
+        """Release the session of this host."""
+        await async_close_session(self._hass, self.host)
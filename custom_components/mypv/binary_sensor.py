@@ -0,0 +1,77 @@
+"""The MYPV binary sensors."""
+
+import logging
+
+from homeassistant.components.binary_sensor import BinarySensorEntity
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import (
+    BINARY_SENSOR_TYPES,
+    DOMAIN,
+    DATA_DEVICE,
+    MypvBinarySensorEntityDescription,
+)
+from .coordinator import (
+    MypvDeviceInfo,
+    async_track_new_sensors,
+    available_sensors,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def async_setup_entry(hass, entry, async_add_entities):
+    """Add the binary sensors of the flags and bitfields an entry reads."""
+    device: MypvDeviceInfo = hass.data[DOMAIN][entry.entry_id][DATA_DEVICE]
+    sensors = set(available_sensors(device, entry.data, entry.options))
+    async_add_entities(
+        MypvBinarySensor(device, binary_type, entry.title)
+        for binary_type, sensor in BINARY_SENSOR_TYPES.items()
+        if sensor.data_key in sensors
+    )
+
+    if entry.options.get("use_all_sensors"):
+        # flags a firmware update added get their sensor without a reload
+        entry.async_on_unload(
+            async_track_new_sensors(
+                device,
+                {sensor.data_key for sensor in BINARY_SENSOR_TYPES.values()} - sensors,
+                lambda found: async_add_entities(
+                    MypvBinarySensor(device, binary_type, entry.title)
+                    for binary_type, sensor in BINARY_SENSOR_TYPES.items()
+                    if sensor.data_key in found
+                ),
+            )
+        )
+
+
+class MypvBinarySensor(CoordinatorEntity, BinarySensorEntity):
+    """Representation of a flag or an error bit of a MYPV device."""
+
+    entity_description: MypvBinarySensorEntityDescription
+
+    def __init__(self, device, binary_type, name):
+        """Initialize the binary sensor."""
+        description = BINARY_SENSOR_TYPES[binary_type]
+        # the coordinator decodes the bits once and only reports edges
+        super().__init__(
+            device.coordinators["data"],
+            context=frozenset({("binary_sensor", binary_type)}),
+        )
+        self.entity_description = description
+        self.type = binary_type
+        self._attr_name = description.name
+        self._attr_unique_id = f"mypv {device.serial} {binary_type}"
+        self._attr_icon = description.icon
+        self._attr_device_class = description.device_class
+        self._attr_device_info = device.device_info(name)
+
+    @property
+    def available(self) -> bool:
+        """Return False while the device doesn't send the flag."""
+        return super().available and self.type in self.coordinator.flags
+
+    @property
+    def is_on(self):
+        """Return True if the flag or bit is set."""
+        return self.coordinator.flags.get(self.type)
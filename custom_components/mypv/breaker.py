@@ -0,0 +1,125 @@
+"""Failure handling for unreachable MYPV devices."""
+
+import time
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Stop polling a host which failed repeatedly.
+
+    After `threshold` consecutive failures the breaker opens and no request is
+    sent until the backoff has passed. The next poll is a probe: success
+    closes the breaker, failure opens it again with twice the backoff.
+    """
+
+    def __init__(self, threshold: int, backoff: float, max_backoff: float) -> None:
+        """Initialize the breaker."""
+        self.threshold = threshold
+        self._base_backoff = backoff
+        self._max_backoff = max_backoff
+        self.backoff = backoff
+        self.failures = 0
+        self.opened_at = None
+        self.trips = 0
+
+    @property
+    def state(self) -> str:
+        """Return the breaker state."""
+        if self.opened_at is None:
+            return STATE_CLOSED
+        if self.retry_in > 0:
+            return STATE_OPEN
+        return STATE_HALF_OPEN
+
+    @property
+    def retry_in(self) -> float:
+        """Return the seconds until the next probe."""
+        if self.opened_at is None:
+            return 0
+        return max(0, self.opened_at + self.backoff - time.monotonic())
+
+    def allow(self) -> bool:
+        """Return True if a request may be sent."""
+        return self.state != STATE_OPEN
+
+    def success(self) -> None:
+        """Record a successful request."""
+        self.failures = 0
+        self.opened_at = None
+        self.backoff = self._base_backoff
+
+    def failure(self) -> None:
+        """Record a failed request."""
+        self.failures += 1
+        if self.opened_at is not None:
+            # the probe failed
+            self.backoff = min(self.backoff * 2, self._max_backoff)
+        elif self.failures < self.threshold:
+            return
+        else:
+            self.trips += 1
+        self.opened_at = time.monotonic()
+
+    @property
+    def diagnostics(self) -> dict:
+        """Return the breaker state."""
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "trips": self.trips,
+            "backoff": self.backoff,
+            "retry_in": self.retry_in,
+        }
+
+
+class PageRetry:
+    """Retry budget and staleness of one page."""
+
+    def __init__(self, backoff: float, max_backoff: float) -> None:
+        """Initialize the retry budget."""
+        self._base_backoff = backoff
+        self._max_backoff = max_backoff
+        self.failures = 0
+        self.next_attempt = 0.0
+        self.last_success = None
+
+    def due(self) -> bool:
+        """Return True if the page may be requested again."""
+        return time.monotonic() >= self.next_attempt
+
+    def success(self) -> None:
+        """Record a successful read."""
+        self.failures = 0
+        self.next_attempt = 0.0
+        self.last_success = time.monotonic()
+
+    def failure(self) -> None:
+        """Record a failed read and back off exponentially."""
+        self.failures += 1
+        self.next_attempt = time.monotonic() + min(
+            self._base_backoff * 2 ** (self.failures - 1), self._max_backoff
+        )
+
+    @property
+    def retry_in(self) -> float:
+        """Return the seconds until the page may be requested again."""
+        return max(0, self.next_attempt - time.monotonic())
+
+    @property
+    def staleness(self) -> float | None:
+        """Return the seconds since the last successful read."""
+        if self.last_success is None:
+            return None
+        return time.monotonic() - self.last_success
+
+    @property
+    def diagnostics(self) -> dict:
+        """Return the retry state."""
+        return {
+            "failures": self.failures,
+            "retry_in": self.retry_in,
+            "staleness": self.staleness,
+        }
@@ -1,8 +1,8 @@
 """Config flow for Kostal piko integration."""
+import asyncio
+
+import aiohttp
 import voluptuous as vol
-import requests
-import json
-from requests.exceptions import HTTPError, ConnectTimeout
 
 from homeassistant import config_entries
 import homeassistant.helpers.config_validation as cv
@@ -16,7 +16,14 @@ from homeassistant.core import HomeAssistant, callback
 from .const import (
     DOMAIN,
     SENSOR_TYPES,
+    DEFAULT_MIN_INTERVAL,
+    DEFAULT_MAX_INTERVAL,
+    DEFAULT_MODBUS_PORT,
+    PAGE_TIMEOUTS,
+    DEFAULT_IP_RANGE,
 )  # pylint:disable=unused-import
+from .api import MypvApi, async_get_probe, async_store_probe
+from .discovery import async_discover
 
 SUPPORTED_SENSOR_TYPES = list(SENSOR_TYPES)
 
@@ -42,6 +49,7 @@ class MypvConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         """Initialize the config flow."""
         self._errors = {}
         self._info = {}
+        self._discovered = {}
 
     def _host_in_configuration_exists(self, host) -> bool:
         """Return True if site_id exists in configuration."""
@@ -49,19 +57,116 @@ class MypvConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             return True
         return False
 
-    def _check_host(self, host) -> bool:
+    async def _async_check_host(self, host) -> bool:
         """Check if we can connect to the mypv."""
+        api = MypvApi(self.hass, host)
         try:
-            response = requests.get(f"http://{host}/mypv_dev.jsn", timeout=10)
-            self._info = json.loads(response.text)
-        except (ConnectTimeout, HTTPError):
+            async with asyncio.timeout(PAGE_TIMEOUTS["mypv_dev"]):
+                self._info = await api.async_get_page("mypv_dev")
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError):
+            # only the entry of a device keeps its session open
+            await api.async_close()
             self._errors[CONF_HOST] = "could_not_connect"
             return False
 
+        # the new entry starts from this probe instead of reading it again
+        async_store_probe(self.hass, host, self._info)
         return True
 
     async def async_step_user(self, user_input=None):
         """Handle the initial step."""
+        if user_input is None:
+            return self.async_show_menu(
+                step_id="user", menu_options=["discovery", "manual"]
+            )
+        return await self.async_step_manual(user_input)
+
+    async def async_step_discovery(self, user_input=None):
+        """Search the devices of an ip range."""
+        if user_input is not None:
+            try:
+                devices = await async_discover(self.hass, user_input["ip_range"])
+            except ValueError:
+                self._errors["ip_range"] = "invalid_ip_range"
+            else:
+                configured = mypv_entries(self.hass)
+                # a device which moved to another address is known by its serial
+                serials = self._async_current_ids()
+                self._discovered = {
+                    host: info
+                    for host, info in devices.items()
+                    if host not in configured and info.get("sn") not in serials
+                }
+                if self._discovered:
+                    return await self.async_step_select()
+                self._errors["base"] = "no_devices_found"
+
+        return self.async_show_form(
+            step_id="discovery",
+            data_schema=vol.Schema(
+                {vol.Required("ip_range", default=DEFAULT_IP_RANGE): str}
+            ),
+            errors=self._errors,
+        )
+
+    async def async_step_select(self, user_input=None):
+        """Add the selected devices of the search."""
+        if user_input is not None and user_input["devices"]:
+            conditions = user_input[CONF_MONITORED_CONDITIONS]
+            host, *others = user_input["devices"]
+            for other in others:
+                # every further device gets its own entry through an import,
+                # which starts from the probe of the search
+                async_store_probe(self.hass, other, self._discovered[other])
+                self.hass.async_create_task(
+                    self.hass.config_entries.flow.async_init(
+                        DOMAIN,
+                        context={"source": config_entries.SOURCE_IMPORT},
+                        data={CONF_HOST: other, CONF_MONITORED_CONDITIONS: conditions},
+                    )
+                )
+            self._info = self._discovered[host]
+            async_store_probe(self.hass, host, self._info)
+            await self.async_set_unique_id(self._info["sn"])
+            self._abort_if_unique_id_configured()
+            return self._async_create_mypv_entry(host, conditions)
+
+        devices = {
+            host: "{} {} ({}) - {}".format(
+                info.get("device"), info.get("sn"), info.get("fwversion"), host
+            )
+            for host, info in self._discovered.items()
+        }
+        default_monitored_conditions = (
+            [] if self._async_current_entries() else DEFAULT_MONITORED_CONDITIONS
+        )
+        return self.async_show_form(
+            step_id="select",
+            data_schema=vol.Schema(
+                {
+                    vol.Required("devices", default=list(devices)): cv.multi_select(
+                        devices
+                    ),
+                    vol.Required(
+                        CONF_MONITORED_CONDITIONS, default=default_monitored_conditions
+                    ): cv.multi_select(SUPPORTED_SENSOR_TYPES),
+                }
+            ),
+        )
+
+    @callback
+    def _async_create_mypv_entry(self, host, conditions):
+        """Create the entry of the probed device."""
+        return self.async_create_entry(
+            title=f"{self._info['device']} - {self._info['number']}",
+            data={
+                CONF_HOST: host,
+                CONF_MONITORED_CONDITIONS: conditions,
+            },
+        )
+
+    async def async_step_manual(self, user_input=None):
+        """Add a device by its ip address."""
 
         if user_input is not None:
             if self._host_in_configuration_exists(user_input[CONF_HOST]):
@@ -69,17 +174,12 @@ class MypvConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             else:
                 host = user_input[CONF_HOST]
                 conditions = user_input[CONF_MONITORED_CONDITIONS]
-                can_connect = await self.hass.async_add_executor_job(
-                    self._check_host, host
-                )
+                can_connect = await self._async_check_host(host)
                 if can_connect:
-                    return self.async_create_entry(
-                        title=f"{self._info['device']} - {self._info['number']}",
-                        data={
-                            CONF_HOST: host,
-                            CONF_MONITORED_CONDITIONS: conditions,
-                        },
-                    )
+                    # a known device at a new address only moves its entry
+                    await self.async_set_unique_id(self._info["sn"])
+                    self._abort_if_unique_id_configured(updates={CONF_HOST: host})
+                    return self._async_create_mypv_entry(host, conditions)
         else:
             user_input = {}
             user_input[CONF_HOST] = "192.168.0.0"
@@ -98,14 +198,23 @@ class MypvConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         )
 
         return self.async_show_form(
-            step_id="user", data_schema=setup_schema, errors=self._errors
+            step_id="manual", data_schema=setup_schema, errors=self._errors
         )
 
     async def async_step_import(self, user_input=None):
         """Import a config entry."""
-        if self._host_in_configuration_exists(user_input[CONF_HOST]):
+        host = user_input[CONF_HOST]
+        if self._host_in_configuration_exists(host):
             return self.async_abort(reason="host_exists")
-        return await self.async_step_user(user_input)
+        # nobody sees a form of an import, a device which can't be read aborts
+        self._info = async_get_probe(self.hass, host)
+        if self._info is None and not await self._async_check_host(host):
+            return self.async_abort(reason="could_not_connect")
+        await self.async_set_unique_id(self._info["sn"])
+        self._abort_if_unique_id_configured(updates={CONF_HOST: host})
+        return self._async_create_mypv_entry(
+            host, user_input[CONF_MONITORED_CONDITIONS]
+        )
 
     @staticmethod
     @callback
@@ -122,33 +231,70 @@ class MypvOptionsFlowHandler(config_entries.OptionsFlow):
 
     async def async_step_init(self, user_input=None):
         """Manage the options."""
-        if user_input is not None:
+        errors = {}
+        if user_input is not None and not (
+            user_input["min_interval"]
+            <= user_input["polling_interval"]
+            <= user_input["max_interval"]
+        ):
+            # adaptive polling moves between the bounds around the interval
+            errors["base"] = "invalid_intervals"
+        elif user_input is not None:
             return self.async_create_entry(
                 title="",
                 data={
                     CONF_MONITORED_CONDITIONS: user_input[CONF_MONITORED_CONDITIONS],
                     "use_all_sensors": user_input["use_all_sensors"],
                     "polling_interval": user_input["polling_interval"],
+                    "adaptive_polling": user_input["adaptive_polling"],
+                    "min_interval": user_input["min_interval"],
+                    "max_interval": user_input["max_interval"],
+                    "transport": user_input["transport"],
+                    "modbus_port": user_input["modbus_port"],
                 },
             )
 
+        # a rejected input is shown again
+        current = {**self.config_entry.options, **(user_input or {})}
         options_schema = vol.Schema(
             {
                 vol.Required(
                     "polling_interval",
-                    default=self.config_entry.options.get("polling_interval", 10),
+                    default=current.get("polling_interval", 10),
+                ): vol.All(int, vol.Range(min=1)),
+                vol.Optional(
+                    "adaptive_polling",
+                    default=current.get("adaptive_polling", False),
+                ): bool,
+                vol.Required(
+                    "min_interval",
+                    default=current.get("min_interval", DEFAULT_MIN_INTERVAL),
+                ): vol.All(int, vol.Range(min=1)),
+                vol.Required(
+                    "max_interval",
+                    default=current.get("max_interval", DEFAULT_MAX_INTERVAL),
+                ): vol.All(int, vol.Range(min=1)),
+                vol.Required(
+                    "transport",
+                    default=current.get("transport", "json"),
+                ): vol.In(["json", "modbus"]),
+                vol.Required(
+                    "modbus_port",
+                    default=current.get("modbus_port", DEFAULT_MODBUS_PORT),
                 ): int,
                 vol.Optional(
                     "use_all_sensors",
-                    default=self.config_entry.options.get("use_all_sensors", False),
+                    default=current.get("use_all_sensors", False),
                 ): bool,
                 vol.Required(
                     CONF_MONITORED_CONDITIONS,
-                    default=self.config_entry.options.get(
+                    default=current.get(
                         CONF_MONITORED_CONDITIONS, DEFAULT_MONITORED_CONDITIONS
                     ),
                 ): cv.multi_select(SUPPORTED_SENSOR_TYPES),
             }
         )
 
-        return self.async_show_form(step_id="init", data_schema=options_schema)
+        return self.async_show_form(
+            step_id="init", data_schema=options_schema, errors=errors
+        )
@@ -2,6 +2,15 @@
 from datetime import timedelta
 from dataclasses import dataclass
 
+from homeassistant.components.binary_sensor import (
+    BinarySensorDeviceClass,
+    BinarySensorEntityDescription,
+)
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntityDescription,
+    SensorStateClass,
+)
 from homeassistant.const import (
     UnitOfPower,
     UnitOfElectricPotential,
@@ -15,220 +24,893 @@ from homeassistant.const import (
 
 DOMAIN = "mypv"
 
-PLATFORMS = [Platform.SENSOR]
+PLATFORMS = [Platform.SENSOR, Platform.BINARY_SENSOR]
 
 DATA_COORDINATOR = "coordinator"
+DATA_DEVICE = "device"
+DATA_CONNECTOR = "connector"
+DATA_SESSIONS = "sessions"
+DATA_INFLIGHT = "inflight"
+DATA_PROBES = "probes"
+DATA_FIRMWARE = "firmware"
+DATA_SCHEDULER = "scheduler"
+
+# keep-alive transport towards the device web server
+HTTP_TIMEOUT = 10
+HTTP_KEEPALIVE = 30
+HTTP_LIMIT_PER_HOST = 3  # one connection per page of a poll
+# seconds a config flow probe is reused by the first poll of the new entry
+PROBE_CACHE_TTL = 60
+
+# subnet scan of the config flow, timeout per host in seconds
+DISCOVERY_TIMEOUT = 1
+DISCOVERY_CONCURRENCY = 256
+DISCOVERY_MAX_HOSTS = 1024
+DEFAULT_IP_RANGE = "192.168.0.0/24"
+
+# a device which is unreachable for this many seconds is searched in the /24
+# of its last address, at most once per RELOCATE_INTERVAL
+RELOCATE_AFTER = 60
+RELOCATE_INTERVAL = 600
+
+# last device snapshot per entry, used to create the entities at startup
+SNAPSHOT_STORAGE_VERSION = 1
+SNAPSHOT_SAVE_DELAY = 60
+
+# requests in flight over all devices
+FLEET_MAX_IN_FLIGHT = 4
+
+# deadline in seconds per page, the pages of a poll are fetched concurrently
+PAGE_TIMEOUTS = {
+    "data": 4,
+    "mypv_dev": 4,
+    "setup": 8,
+    "modbus": 2,
+}
+
+# a host is given up after this many failed polls and probed again after a
+# backoff in seconds, which doubles with every failed probe
+BREAKER_THRESHOLD = 3
+BREAKER_BACKOFF = 10
+BREAKER_MAX_BACKOFF = 600
+# a failed page is retried after a backoff in seconds, doubling per failure
+PAGE_RETRY_BACKOFF = 10
+PAGE_RETRY_MAX_BACKOFF = 900
+
+# setup.jsn is read again after this many seconds, right after a setting was
+# written or when one of the trigger keys of data.jsn changed
+SETUP_REFRESH_INTERVAL = 86400
+SETUP_TRIGGER_KEYS = ("screen_mode_flag",)
+# fired with the changed setup keys of a device
+EVENT_SETUP_CHANGED = f"{DOMAIN}_setup_changed"
+
+# latest firmware versions, looked up per serial number in the background
+CONF_FIRMWARE_URL = "firmware_url"
+FIRMWARE_URL = "https://www.my-pv.com/download/currentversion.php"
+FIRMWARE_TTL = 86400
+FIRMWARE_RETRY = 3600
+FIRMWARE_REQUEST_SPACING = 10
+FIRMWARE_TIMEOUT = 30
+FIRMWARE_STORAGE_VERSION = 1
+FIRMWARE_SAVE_DELAY = 10
+# response key -> sensor key
+FIRMWARE_KEYS = {
+    "fwversion": "fwversionlatest",
+    "psversion": "psversionlatest",
+    "p9sversion": "p9sversionlatest",
+}
+
+# Modbus TCP transport
+DEFAULT_MODBUS_PORT = 502
+MODBUS_MAX_BLOCK = 125
+MODBUS_MAX_GAP = 8
+# data.jsn is still read at this interval in seconds for the values which have
+# no register, the registers are overlaid on every poll
+MODBUS_JSON_INTERVAL = 60
+# AC-THOR / AC ELWA 2 holding registers, keyed like data.jsn and in the same
+# units as data.jsn
+MODBUS_REGISTERS = {
+    "power": 1000,
+    "temp1": 1001,
+    "temp2": 1030,
+    "temp3": 1031,
+    "temp4": 1032,
+    "volt_mains": 1067,
+    "curr_mains": 1068,
+    "power_act": 1069,
+    "power_solar_act": 1074,
+    "power_grid_act": 1075,
+}
+# registers holding a two's complement value, the grid power is negative
+# while feeding in
+MODBUS_SIGNED_REGISTERS = frozenset({"power_grid_act"})
 
 MIN_TIME_BETWEEN_UPDATES = timedelta(seconds=10)
 
+# adaptive polling, bounds in seconds
+DEFAULT_MIN_INTERVAL = 2
+DEFAULT_MAX_INTERVAL = 300
+# a change of these data keys speeds polling up to the minimum interval
+ACTIVITY_KEYS = ("power", "power_act", "status", "boostactive")
+
 # short name . long name
 MYPV_DEVICES = {
     "AC ELWA-E": "elwa",
     "AC-THOR": "acthor",
-    "AC-THOR 9s": "actor9s",
+    "AC-THOR 9s": "acthor9s",
     "AC ELWA-2": "elwa2",
     "Wi-Fi Meter": "meter",
 }
 
+# sensors published as enum: namespace of their codes in trans.py and the
+# code of its first entry, the status codes differ per model
+ENUM_SENSORS = {
+    "status": ("info_state_{model}_", 0),
+    "cloudstate": ("info_cloudstate_", 0),
+}
+
 
-@dataclass
-class S:
-    name_long: str
-    unit: str = None
-    icon: str = ""
+@dataclass(frozen=True, kw_only=True)
+class MypvSensorEntityDescription(SensorEntityDescription):
+    """Describes a MYPV sensor and the page its value is read from."""
+
+    # space separated short model names, empty for all models
     device: str = ""
     source: str = "data"
+    # other keys of the page the state is built from
+    depends: tuple = ()
 
 
-# sensor_type: [name, unit, icon, page, devices]
 SENSOR_TYPES = {
-    "device": S("Device"),
-    "acthor9s": S("Acthor 9s"),
-    "fwversion": S("Firmware Version", icon="mdi:numeric"),
-    "psversion": S("Power Supply Version", icon="mdi:numeric"),
-    "p9sversion": S("Power Supply Version Acthor 9", icon="mdi:numeric"),
-    "screen_mode_flag": S("Screen Mode"),
-    "status": S("Status ID", device="elwa acthor acthor9s elwa2"),
-    "power": S(
-        "Aktueller Verbrauch", UnitOfPower.WATT, "mdi:lightning-bolt", device="elwa"
-    ),
-    "boostpower": S(
-        "Warmwassersicherstellung",
-        UnitOfPower.WATT,
-        "mdi:thermometer-lines",
+    "device": MypvSensorEntityDescription(
+        key="device",
+        name="Device",
+    ),
+    "acthor9s": MypvSensorEntityDescription(
+        key="acthor9s",
+        name="Acthor 9s",
+    ),
+    "fwversion": MypvSensorEntityDescription(
+        key="fwversion",
+        name="Firmware Version",
+        icon="mdi:numeric",
+    ),
+    "psversion": MypvSensorEntityDescription(
+        key="psversion",
+        name="Power Supply Version",
+        icon="mdi:numeric",
+    ),
+    "p9sversion": MypvSensorEntityDescription(
+        key="p9sversion",
+        name="Power Supply Version Acthor 9",
+        icon="mdi:numeric",
+    ),
+    "screen_mode_flag": MypvSensorEntityDescription(
+        key="screen_mode_flag",
+        name="Screen Mode",
+    ),
+    "status": MypvSensorEntityDescription(
+        key="status",
+        name="Status ID",
+        device="elwa acthor acthor9s elwa2",
+    ),
+    "power": MypvSensorEntityDescription(
+        key="power",
+        name="Aktueller Verbrauch",
+        native_unit_of_measurement=UnitOfPower.WATT,
+        icon="mdi:lightning-bolt",
         device="elwa",
+        device_class=SensorDeviceClass.POWER,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    "boostpower": MypvSensorEntityDescription(
+        key="boostpower",
+        name="Warmwassersicherstellung",
+        native_unit_of_measurement=UnitOfPower.WATT,
+        icon="mdi:thermometer-lines",
+        device="elwa",
+    ),
+    "power_act": MypvSensorEntityDescription(
+        key="power_act",
+        name="Power AC-Thor",
+        native_unit_of_measurement=UnitOfPower.WATT,
+        icon="mdi:lightning-bolt",
+        device="acthor",
+        depends=("rel1_out", "load_nom"),
+    ),
+    "power_solar_act": MypvSensorEntityDescription(
+        key="power_solar_act",
+        name="Power from solar",
+        native_unit_of_measurement=UnitOfPower.WATT,
+        icon="mdi:solar-power-variant",
+    ),
+    "power_grid_act": MypvSensorEntityDescription(
+        key="power_grid_act",
+        name="Power from grid",
+        native_unit_of_measurement=UnitOfPower.WATT,
+        icon="mdi:transmission-tower-export",
+    ),
+    "power_ac9": MypvSensorEntityDescription(
+        key="power_ac9",
+        name="Power Acthor 9",
+        native_unit_of_measurement=UnitOfPower.WATT,
+        icon="mdi:lightning-bolt",
+    ),
+    "power_solar_ac9": MypvSensorEntityDescription(
+        key="power_solar_ac9",
+        name="Power from solar Acthor 9",
+        native_unit_of_measurement=UnitOfPower.WATT,
+        icon="mdi:solar-power-variant",
+    ),
+    "power_grid_ac9": MypvSensorEntityDescription(
+        key="power_grid_ac9",
+        name="Power from grid Acthor 9",
+        native_unit_of_measurement=UnitOfPower.WATT,
+        icon="mdi:transmission-tower-export",
+    ),
+    "power1_solar": MypvSensorEntityDescription(
+        key="power1_solar",
+        name="power1_solar",
+        native_unit_of_measurement=UnitOfPower.WATT,
+        icon="mdi:solar-power-variant",
+    ),
+    "power1_grid": MypvSensorEntityDescription(
+        key="power1_grid",
+        name="power1_grid",
+        native_unit_of_measurement=UnitOfPower.WATT,
+        icon="mdi:transmission-tower-export",
+    ),
+    "power2_solar": MypvSensorEntityDescription(
+        key="power2_solar",
+        name="power2_solar",
+        native_unit_of_measurement=UnitOfPower.WATT,
+        icon="mdi:solar-power-variant",
+    ),
+    "power2_grid": MypvSensorEntityDescription(
+        key="power2_grid",
+        name="power2_grid",
+        native_unit_of_measurement=UnitOfPower.WATT,
+        icon="mdi:transmission-tower-export",
     ),
-    "power_act": S(
-        "Power AC-Thor", UnitOfPower.WATT, "mdi:lightning-bolt", device="acthor"
-    ),
-    "power_solar_act": S(
-        "Power from solar", UnitOfPower.WATT, "mdi:solar-power-variant"
-    ),
-    "power_grid_act": S(
-        "Power from grid", UnitOfPower.WATT, "mdi:transmission-tower-export"
-    ),
-    "power_ac9": S("Power Acthor 9", UnitOfPower.WATT, "mdi:lightning-bolt"),
-    "power_solar_ac9": S(
-        "Power from solar Acthor 9", UnitOfPower.WATT, "mdi:solar-power-variant"
-    ),
-    "power_grid_ac9": S(
-        "Power from grid Acthor 9", UnitOfPower.WATT, "mdi:transmission-tower-export"
-    ),
-    "power1_solar": S("power1_solar", UnitOfPower.WATT, "mdi:solar-power-variant"),
-    "power1_grid": S("power1_grid", UnitOfPower.WATT, "mdi:transmission-tower-export"),
-    "power2_solar": S("power2_solar", UnitOfPower.WATT, "mdi:solar-power-variant"),
-    "power2_grid": S("power2_grid", UnitOfPower.WATT, "mdi:transmission-tower-export"),
-    "power3_solar": S("power3_solar", UnitOfPower.WATT, "mdi:solar-power-variant"),
-    "power3_grid": S("power3_grid", UnitOfPower.WATT, "mdi:transmission-tower-export"),
-    "load_state": S("load_state"),
-    "load_nom": S("load_nom", UnitOfPower.WATT),
-    "rel1_out": S("rel1_out", icon="mdi:electric-switch"),
-    "ww1target": S(
-        "target_temperature",
-        UnitOfTemperature.CELSIUS,
-        "mdi:thermometer-auto",
+    "power3_solar": MypvSensorEntityDescription(
+        key="power3_solar",
+        name="power3_solar",
+        native_unit_of_measurement=UnitOfPower.WATT,
+        icon="mdi:solar-power-variant",
+    ),
+    "power3_grid": MypvSensorEntityDescription(
+        key="power3_grid",
+        name="power3_grid",
+        native_unit_of_measurement=UnitOfPower.WATT,
+        icon="mdi:transmission-tower-export",
+    ),
+    "load_state": MypvSensorEntityDescription(
+        key="load_state",
+        name="load_state",
+    ),
+    "load_nom": MypvSensorEntityDescription(
+        key="load_nom",
+        name="load_nom",
+        native_unit_of_measurement=UnitOfPower.WATT,
+    ),
+    "rel1_out": MypvSensorEntityDescription(
+        key="rel1_out",
+        name="rel1_out",
+        icon="mdi:electric-switch",
+    ),
+    "ww1target": MypvSensorEntityDescription(
+        key="ww1target",
+        name="target_temperature",
+        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+        icon="mdi:thermometer-auto",
         device="elwa",
     ),
-    "temp1": S(
-        "Speicher Temperatur 1",
-        UnitOfTemperature.CELSIUS,
-        "mdi:thermometer-water",
+    "temp1": MypvSensorEntityDescription(
+        key="temp1",
+        name="Speicher Temperatur 1",
+        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+        icon="mdi:thermometer-water",
         device="elwa acthor acthor9s elwa2",
     ),
-    "temp2": S(
-        "Temperatur 2",
-        UnitOfTemperature.CELSIUS,
-        "mdi:thermometer",
+    "temp2": MypvSensorEntityDescription(
+        key="temp2",
+        name="Temperatur 2",
+        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+        icon="mdi:thermometer",
         device="acthor acthor9s",
     ),
-    "temp3": S(
-        "Temperatur 3",
-        UnitOfTemperature.CELSIUS,
-        "mdi:thermometer",
+    "temp3": MypvSensorEntityDescription(
+        key="temp3",
+        name="Temperatur 3",
+        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+        icon="mdi:thermometer",
         device="acthor acthor9s",
     ),
-    "temp4": S(
-        "Temperatur 4",
-        UnitOfTemperature.CELSIUS,
-        "mdi:thermometer",
+    "temp4": MypvSensorEntityDescription(
+        key="temp4",
+        name="Temperatur 4",
+        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+        icon="mdi:thermometer",
         device="acthor acthor9s",
     ),
-    "boostactive": S("Boost active", icon="mdi:thermometer-chevron-up"),
-    "legboostnext": S("Nächster Legionellen Boost", UnitOfTime.DAYS, "mdi:bacteria"),
-    "date": S("Date", icon="mdi:calendar-today"),
-    "loctime": S("Lokale Uhrzeit", icon="mdi:home-clock"),
-    "unixtime": S("Unix time", icon="mdi:web-clock"),
-    "wp_flag": S("wp_flag"),
-    "wp_time1_ctr": S("wp_time1_ctr"),
-    "wp_time2_ctr": S("wp_time2_ctr"),
-    "wp_time3_ctr": S("wp_time3_ctr"),
-    "pump_pwm": S("Pump PWM", icon="mdi:pump"),
-    "schicht_flag": S("Schicht"),
-    "act_night_flag": S("Night flag"),
-    "ctrlstate": S("ctrlstate"),
-    "blockactive": S("Block active"),
-    "error_state": S("Error state", icon="mdi:alert-circle"),
-    "meter1_id": S("my-PV Meter 1 ID", icon="mdi:identifier"),
-    "meter1_ip": S("my-PV Meter 1 IP", icon="mdi:ip-network"),
-    "meter2_id": S("my-PV Meter 2 ID", icon="mdi:identifier"),
-    "meter2_ip": S("my-PV Meter 2 IP", icon="mdi:ip-network"),
-    "meter3_id": S("my-PV Meter 3 ID", icon="mdi:identifier"),
-    "meter3_ip": S("my-PV Meter 3 IP", icon="mdi:ip-network"),
-    "meter4_id": S("my-PV Meter 4 ID", icon="mdi:identifier"),
-    "meter4_ip": S("my-PV Meter 4 IP", icon="mdi:ip-network"),
-    "meter5_id": S("my-PV Meter 5 ID", icon="mdi:identifier"),
-    "meter5_ip": S("my-PV Meter 5 IP", icon="mdi:ip-network"),
-    "meter6_id": S("my-PV Meter 6 ID", icon="mdi:identifier"),
-    "meter6_ip": S("my-PV Meter 6 IP", icon="mdi:ip-network"),
-    "meter_ss": S("WiFi Meter Signalstärke", PERCENTAGE, "mdi:wifi"),
-    "meter_ssid": S("meter_ssid", icon="mdi:wifi-marker"),
-    "surplus": S(
-        "Meter + Batterieladeleistung", UnitOfPower.WATT, "mdi:lightning-bolt"
-    ),
-    "m0sum": S("Hausanschluss", UnitOfPower.WATT, "mdi:transmission-tower"),
-    "m0l1": S("Hausanschluss L1", UnitOfPower.WATT, "mdi:transmission-tower"),
-    "m0l2": S("Hausanschluss L2", UnitOfPower.WATT, "mdi:transmission-tower"),
-    "m0l3": S("Hausanschluss L3", UnitOfPower.WATT, "mdi:transmission-tower"),
-    "m0bat": S("Batteriespeicher", UnitOfPower.WATT, "mdi:transmission-tower"),
-    "m1sum": S("PV Leistung", UnitOfPower.WATT, "mdi:solar-power"),
-    "m1l1": S("PV Leistung L1", UnitOfPower.WATT, "mdi:solar-power"),
-    "m1l2": S("PV Leistung L2", UnitOfPower.WATT, "mdi:solar-power"),
-    "m1l3": S("PV Leistung L3", UnitOfPower.WATT, "mdi:solar-power"),
-    "m1devstate": S("PV Kommunikationsstatus", icon="mdi:link"),
-    "m2sum": S("Batterie Leistung", UnitOfPower.WATT, "mdi:home-battery"),
-    "m2l1": S("Batterie Leistung L1", UnitOfPower.WATT, "mdi:home-battery"),
-    "m2l2": S("Batterie Leistung L2", UnitOfPower.WATT, "mdi:home-battery"),
-    "m2l3": S("Batterie Leistung L3", UnitOfPower.WATT, "mdi:home-battery"),
-    "m2soc": S("Batterie SoC", PERCENTAGE, "mdi:battery-charging-50"),
-    "m2state": S("Batterie Status", icon="mdi:battery-heart-variant"),
-    "m2devstate": S("Batterie Kommunikationsstatus", icon="mdi:link"),
-    "m3sum": S("Ladestation Leistung", UnitOfPower.WATT, "mdi:ev-station"),
-    "m3l1": S("Ladestation L1", UnitOfPower.WATT, "mdi:ev-station"),
-    "m3l2": S("Ladestation L2", UnitOfPower.WATT, "mdi:ev-station"),
-    "m3l3": S("Ladestation L2", UnitOfPower.WATT, "mdi:ev-station"),
-    "m3soc": S("Ladestation SoC", PERCENTAGE, "mdi:battery-charging-50"),
-    "m3devstate": S("Ladestation Kommunikationsstatus", icon="mdi:link"),
-    "m4sum": S("Wärmepumpe Leistung", UnitOfPower.WATT, "mdi:heat-pump"),
-    "m4l1": S("Wärmepumpe L1", UnitOfPower.WATT, "mdi:heat-pump"),
-    "m4l2": S("Wärmepumpe L2", UnitOfPower.WATT, "mdi:heat-pump"),
-    "m4l3": S("Wärmepumpe L3", UnitOfPower.WATT, "mdi:heat-pump"),
-    "m4devstate": S("Wärmepumpe Kommunikationsstatus", icon="mdi:link"),
-    "ecarstate": S("E-Auto Status", icon="mdi:car-electric"),
-    "ecarboostctr": S("ecarboostctr"),
-    "mss2": S("Sekundärregler 2 Status"),
-    "mss3": S("Sekundärregler 3 Status"),
-    "mss4": S("Sekundärregler 4 Status"),
-    "mss5": S("Sekundärregler 5 Status"),
-    "mss6": S("Sekundärregler 6 Status"),
-    "mss7": S("Sekundärregler 7 Status"),
-    "mss8": S("Sekundärregler 8 Status"),
-    "mss9": S("Sekundärregler 9 Status"),
-    "mss10": S("Sekundärregler 10 Status"),
-    "mss11": S("Sekundärregler 11 Status"),
-    "tempchip": S("tempchip", UnitOfTemperature.CELSIUS, "mdi:chip"),
-    "volt_mains": S(
-        "Eingangsspannung Leistungsteil L1",
-        UnitOfElectricPotential.VOLT,
-        "mdi:flash-triangle",
-    ),
-    "curr_mains": S("Current L1", UnitOfElectricCurrent.AMPERE, "mdi:current-ac"),
-    "volt_L2": S(
-        "Eingangsspannung Leistungsteil L2",
-        UnitOfElectricPotential.VOLT,
-        "mdi:flash-triangle",
-    ),
-    "curr_L2": S("Current L2", UnitOfElectricCurrent.AMPERE, "mdi:current-ac"),
-    "volt_L3": S(
-        "Eingangsspannung Leistungsteil L3",
-        UnitOfElectricPotential.VOLT,
-        "mdi:flash-triangle",
-    ),
-    "curr_L3": S("Current L3", UnitOfElectricCurrent.AMPERE, "mdi:current-ac"),
-    "volt_out": S(
-        "AusgangsspannungLeistungsteil",
-        UnitOfElectricPotential.VOLT,
-        "mdi:flash-triangle",
-    ),
-    "freq": S("Netzfrequenz", UnitOfFrequency.HERTZ, "mdi:sine-wave"),
-    "temp_ps": S(
-        "Temperatur Leistungsteil", UnitOfTemperature.CELSIUS, "mdi:thermometer"
-    ),
-    "fan_speed": S("Lüfterstufe", icon="mdi:fan"),
-    "ps_state": S("Status Leistungsteil"),
-    "cur_ip": S("IP", icon="mdi:ip-network"),
-    "cur_sn": S("Serial number", icon="mdi:numeric"),
-    "cur_gw": S("Gateway", icon="mdi:router-network"),
-    "cur_dns": S("DNS"),
-    "fwversionlatest": S("latest Firmware version", icon="mdi:numeric"),
-    "psversionlatest": S("latest Power supply version", icon="mdi:numeric"),
-    "p9sversionlatest": S("latest Power supply version Acthor 9", icon="mdi:numeric"),
-    "upd_state": S("Update state", icon="mdi:update"),
-    "upd_files_left": S("Update files left", icon="mdi:update"),
-    "ps_upd_state": S("Power supply update state", icon="mdi:update"),
-    "p9s_upd_state": S("Acthor 9 Power supply update state", icon="mdi:update"),
-    "cloudstate": S("Cloud Status", icon="mdi:cloud-check"),
-    "debug_ip": S("Debug IP", icon="mdi:ip-network"),
+    "boostactive": MypvSensorEntityDescription(
+        key="boostactive",
+        name="Boost active",
+        icon="mdi:thermometer-chevron-up",
+    ),
+    "legboostnext": MypvSensorEntityDescription(
+        key="legboostnext",
+        name="Nächster Legionellen Boost",
+        native_unit_of_measurement=UnitOfTime.DAYS,
+        icon="mdi:bacteria",
+    ),
+    "date": MypvSensorEntityDescription(
+        key="date",
+        name="Date",
+        icon="mdi:calendar-today",
+    ),
+    "loctime": MypvSensorEntityDescription(
+        key="loctime",
+        name="Lokale Uhrzeit",
+        icon="mdi:home-clock",
+    ),
+    "unixtime": MypvSensorEntityDescription(
+        key="unixtime",
+        name="Unix time",
+        icon="mdi:web-clock",
+    ),
+    "wp_flag": MypvSensorEntityDescription(
+        key="wp_flag",
+        name="wp_flag",
+    ),
+    "wp_time1_ctr": MypvSensorEntityDescription(
+        key="wp_time1_ctr",
+        name="wp_time1_ctr",
+    ),
+    "wp_time2_ctr": MypvSensorEntityDescription(
+        key="wp_time2_ctr",
+        name="wp_time2_ctr",
+    ),
+    "wp_time3_ctr": MypvSensorEntityDescription(
+        key="wp_time3_ctr",
+        name="wp_time3_ctr",
+    ),
+    "pump_pwm": MypvSensorEntityDescription(
+        key="pump_pwm",
+        name="Pump PWM",
+        icon="mdi:pump",
+    ),
+    "schicht_flag": MypvSensorEntityDescription(
+        key="schicht_flag",
+        name="Schicht",
+    ),
+    "act_night_flag": MypvSensorEntityDescription(
+        key="act_night_flag",
+        name="Night flag",
+    ),
+    "ctrlstate": MypvSensorEntityDescription(
+        key="ctrlstate",
+        name="ctrlstate",
+    ),
+    "blockactive": MypvSensorEntityDescription(
+        key="blockactive",
+        name="Block active",
+    ),
+    "error_state": MypvSensorEntityDescription(
+        key="error_state",
+        name="Error state",
+        icon="mdi:alert-circle",
+    ),
+    "meter1_id": MypvSensorEntityDescription(
+        key="meter1_id",
+        name="my-PV Meter 1 ID",
+        icon="mdi:identifier",
+    ),
+    "meter1_ip": MypvSensorEntityDescription(
+        key="meter1_ip",
+        name="my-PV Meter 1 IP",
+        icon="mdi:ip-network",
+    ),
+    "meter2_id": MypvSensorEntityDescription(
+        key="meter2_id",
+        name="my-PV Meter 2 ID",
+        icon="mdi:identifier",
+    ),
+    "meter2_ip": MypvSensorEntityDescription(
+        key="meter2_ip",
+        name="my-PV Meter 2 IP",
+        icon="mdi:ip-network",
+    ),
+    "meter3_id": MypvSensorEntityDescription(
+        key="meter3_id",
+        name="my-PV Meter 3 ID",
+        icon="mdi:identifier",
+    ),
+    "meter3_ip": MypvSensorEntityDescription(
+        key="meter3_ip",
+        name="my-PV Meter 3 IP",
+        icon="mdi:ip-network",
+    ),
+    "meter4_id": MypvSensorEntityDescription(
+        key="meter4_id",
+        name="my-PV Meter 4 ID",
+        icon="mdi:identifier",
+    ),
+    "meter4_ip": MypvSensorEntityDescription(
+        key="meter4_ip",
+        name="my-PV Meter 4 IP",
+        icon="mdi:ip-network",
+    ),
+    "meter5_id": MypvSensorEntityDescription(
+        key="meter5_id",
+        name="my-PV Meter 5 ID",
+        icon="mdi:identifier",
+    ),
+    "meter5_ip": MypvSensorEntityDescription(
+        key="meter5_ip",
+        name="my-PV Meter 5 IP",
+        icon="mdi:ip-network",
+    ),
+    "meter6_id": MypvSensorEntityDescription(
+        key="meter6_id",
+        name="my-PV Meter 6 ID",
+        icon="mdi:identifier",
+    ),
+    "meter6_ip": MypvSensorEntityDescription(
+        key="meter6_ip",
+        name="my-PV Meter 6 IP",
+        icon="mdi:ip-network",
+    ),
+    "meter_ss": MypvSensorEntityDescription(
+        key="meter_ss",
+        name="WiFi Meter Signalstärke",
+        native_unit_of_measurement=PERCENTAGE,
+        icon="mdi:wifi",
+    ),
+    "meter_ssid": MypvSensorEntityDescription(
+        key="meter_ssid",
+        name="meter_ssid",
+        icon="mdi:wifi-marker",
+    ),
+    "surplus": MypvSensorEntityDescription(
+        key="surplus",
+        name="Meter + Batterieladeleistung",
+        native_unit_of_measurement=UnitOfPower.WATT,
+        icon="mdi:lightning-bolt",
+    ),
+    "m0sum": MypvSensorEntityDescription(
+        key="m0sum",
+        name="Hausanschluss",
+        native_unit_of_measurement=UnitOfPower.WATT,
+        icon="mdi:transmission-tower",
+    ),
+    "m0l1": MypvSensorEntityDescription(
+        key="m0l1",
+        name="Hausanschluss L1",
+        native_unit_of_measurement=UnitOfPower.WATT,
+        icon="mdi:transmission-tower",
+    ),
+    "m0l2": MypvSensorEntityDescription(
+        key="m0l2",
+        name="Hausanschluss L2",
+        native_unit_of_measurement=UnitOfPower.WATT,
+        icon="mdi:transmission-tower",
+    ),
+    "m0l3": MypvSensorEntityDescription(
+        key="m0l3",
+        name="Hausanschluss L3",
+        native_unit_of_measurement=UnitOfPower.WATT,
+        icon="mdi:transmission-tower",
+    ),
+    "m0bat": MypvSensorEntityDescription(
+        key="m0bat",
+        name="Batteriespeicher",
+        native_unit_of_measurement=UnitOfPower.WATT,
+        icon="mdi:transmission-tower",
+    ),
+    "m1sum": MypvSensorEntityDescription(
+        key="m1sum",
+        name="PV Leistung",
+        native_unit_of_measurement=UnitOfPower.WATT,
+        icon="mdi:solar-power",
+    ),
+    "m1l1": MypvSensorEntityDescription(
+        key="m1l1",
+        name="PV Leistung L1",
+        native_unit_of_measurement=UnitOfPower.WATT,
+        icon="mdi:solar-power",
+    ),
+    "m1l2": MypvSensorEntityDescription(
+        key="m1l2",
+        name="PV Leistung L2",
+        native_unit_of_measurement=UnitOfPower.WATT,
+        icon="mdi:solar-power",
+    ),
+    "m1l3": MypvSensorEntityDescription(
+        key="m1l3",
+        name="PV Leistung L3",
+        native_unit_of_measurement=UnitOfPower.WATT,
+        icon="mdi:solar-power",
+    ),
+    "m1devstate": MypvSensorEntityDescription(
+        key="m1devstate",
+        name="PV Kommunikationsstatus",
+        icon="mdi:link",
+    ),
+    "m2sum": MypvSensorEntityDescription(
+        key="m2sum",
+        name="Batterie Leistung",
+        native_unit_of_measurement=UnitOfPower.WATT,
+        icon="mdi:home-battery",
+    ),
+    "m2l1": MypvSensorEntityDescription(
+        key="m2l1",
+        name="Batterie Leistung L1",
+        native_unit_of_measurement=UnitOfPower.WATT,
+        icon="mdi:home-battery",
+    ),
+    "m2l2": MypvSensorEntityDescription(
+        key="m2l2",
+        name="Batterie Leistung L2",
+        native_unit_of_measurement=UnitOfPower.WATT,
+        icon="mdi:home-battery",
+    ),
+    "m2l3": MypvSensorEntityDescription(
+        key="m2l3",
+        name="Batterie Leistung L3",
+        native_unit_of_measurement=UnitOfPower.WATT,
+        icon="mdi:home-battery",
+    ),
+    "m2soc": MypvSensorEntityDescription(
+        key="m2soc",
+        name="Batterie SoC",
+        native_unit_of_measurement=PERCENTAGE,
+        icon="mdi:battery-charging-50",
+    ),
+    "m2state": MypvSensorEntityDescription(
+        key="m2state",
+        name="Batterie Status",
+        icon="mdi:battery-heart-variant",
+    ),
+    "m2devstate": MypvSensorEntityDescription(
+        key="m2devstate",
+        name="Batterie Kommunikationsstatus",
+        icon="mdi:link",
+    ),
+    "m3sum": MypvSensorEntityDescription(
+        key="m3sum",
+        name="Ladestation Leistung",
+        native_unit_of_measurement=UnitOfPower.WATT,
+        icon="mdi:ev-station",
+    ),
+    "m3l1": MypvSensorEntityDescription(
+        key="m3l1",
+        name="Ladestation L1",
+        native_unit_of_measurement=UnitOfPower.WATT,
+        icon="mdi:ev-station",
+    ),
+    "m3l2": MypvSensorEntityDescription(
+        key="m3l2",
+        name="Ladestation L2",
+        native_unit_of_measurement=UnitOfPower.WATT,
+        icon="mdi:ev-station",
+    ),
+    "m3l3": MypvSensorEntityDescription(
+        key="m3l3",
+        name="Ladestation L2",
+        native_unit_of_measurement=UnitOfPower.WATT,
+        icon="mdi:ev-station",
+    ),
+    "m3soc": MypvSensorEntityDescription(
+        key="m3soc",
+        name="Ladestation SoC",
+        native_unit_of_measurement=PERCENTAGE,
+        icon="mdi:battery-charging-50",
+    ),
+    "m3devstate": MypvSensorEntityDescription(
+        key="m3devstate",
+        name="Ladestation Kommunikationsstatus",
+        icon="mdi:link",
+    ),
+    "m4sum": MypvSensorEntityDescription(
+        key="m4sum",
+        name="Wärmepumpe Leistung",
+        native_unit_of_measurement=UnitOfPower.WATT,
+        icon="mdi:heat-pump",
+    ),
+    "m4l1": MypvSensorEntityDescription(
+        key="m4l1",
+        name="Wärmepumpe L1",
+        native_unit_of_measurement=UnitOfPower.WATT,
+        icon="mdi:heat-pump",
+    ),
+    "m4l2": MypvSensorEntityDescription(
+        key="m4l2",
+        name="Wärmepumpe L2",
+        native_unit_of_measurement=UnitOfPower.WATT,
+        icon="mdi:heat-pump",
+    ),
+    "m4l3": MypvSensorEntityDescription(
+        key="m4l3",
+        name="Wärmepumpe L3",
+        native_unit_of_measurement=UnitOfPower.WATT,
+        icon="mdi:heat-pump",
+    ),
+    "m4devstate": MypvSensorEntityDescription(
+        key="m4devstate",
+        name="Wärmepumpe Kommunikationsstatus",
+        icon="mdi:link",
+    ),
+    "ecarstate": MypvSensorEntityDescription(
+        key="ecarstate",
+        name="E-Auto Status",
+        icon="mdi:car-electric",
+    ),
+    "ecarboostctr": MypvSensorEntityDescription(
+        key="ecarboostctr",
+        name="ecarboostctr",
+    ),
+    "mss2": MypvSensorEntityDescription(
+        key="mss2",
+        name="Sekundärregler 2 Status",
+    ),
+    "mss3": MypvSensorEntityDescription(
+        key="mss3",
+        name="Sekundärregler 3 Status",
+    ),
+    "mss4": MypvSensorEntityDescription(
+        key="mss4",
+        name="Sekundärregler 4 Status",
+    ),
+    "mss5": MypvSensorEntityDescription(
+        key="mss5",
+        name="Sekundärregler 5 Status",
+    ),
+    "mss6": MypvSensorEntityDescription(
+        key="mss6",
+        name="Sekundärregler 6 Status",
+    ),
+    "mss7": MypvSensorEntityDescription(
+        key="mss7",
+        name="Sekundärregler 7 Status",
+    ),
+    "mss8": MypvSensorEntityDescription(
+        key="mss8",
+        name="Sekundärregler 8 Status",
+    ),
+    "mss9": MypvSensorEntityDescription(
+        key="mss9",
+        name="Sekundärregler 9 Status",
+    ),
+    "mss10": MypvSensorEntityDescription(
+        key="mss10",
+        name="Sekundärregler 10 Status",
+    ),
+    "mss11": MypvSensorEntityDescription(
+        key="mss11",
+        name="Sekundärregler 11 Status",
+    ),
+    "tempchip": MypvSensorEntityDescription(
+        key="tempchip",
+        name="tempchip",
+        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+        icon="mdi:chip",
+    ),
+    "volt_mains": MypvSensorEntityDescription(
+        key="volt_mains",
+        name="Eingangsspannung Leistungsteil L1",
+        native_unit_of_measurement=UnitOfElectricPotential.VOLT,
+        icon="mdi:flash-triangle",
+    ),
+    "curr_mains": MypvSensorEntityDescription(
+        key="curr_mains",
+        name="Current L1",
+        native_unit_of_measurement=UnitOfElectricCurrent.AMPERE,
+        icon="mdi:current-ac",
+    ),
+    "volt_L2": MypvSensorEntityDescription(
+        key="volt_L2",
+        name="Eingangsspannung Leistungsteil L2",
+        native_unit_of_measurement=UnitOfElectricPotential.VOLT,
+        icon="mdi:flash-triangle",
+    ),
+    "curr_L2": MypvSensorEntityDescription(
+        key="curr_L2",
+        name="Current L2",
+        native_unit_of_measurement=UnitOfElectricCurrent.AMPERE,
+        icon="mdi:current-ac",
+    ),
+    "volt_L3": MypvSensorEntityDescription(
+        key="volt_L3",
+        name="Eingangsspannung Leistungsteil L3",
+        native_unit_of_measurement=UnitOfElectricPotential.VOLT,
+        icon="mdi:flash-triangle",
+    ),
+    "curr_L3": MypvSensorEntityDescription(
+        key="curr_L3",
+        name="Current L3",
+        native_unit_of_measurement=UnitOfElectricCurrent.AMPERE,
+        icon="mdi:current-ac",
+    ),
+    "volt_out": MypvSensorEntityDescription(
+        key="volt_out",
+        name="AusgangsspannungLeistungsteil",
+        native_unit_of_measurement=UnitOfElectricPotential.VOLT,
+        icon="mdi:flash-triangle",
+    ),
+    "freq": MypvSensorEntityDescription(
+        key="freq",
+        name="Netzfrequenz",
+        native_unit_of_measurement=UnitOfFrequency.HERTZ,
+        icon="mdi:sine-wave",
+    ),
+    "temp_ps": MypvSensorEntityDescription(
+        key="temp_ps",
+        name="Temperatur Leistungsteil",
+        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+        icon="mdi:thermometer",
+    ),
+    "fan_speed": MypvSensorEntityDescription(
+        key="fan_speed",
+        name="Lüfterstufe",
+        icon="mdi:fan",
+    ),
+    "ps_state": MypvSensorEntityDescription(
+        key="ps_state",
+        name="Status Leistungsteil",
+    ),
+    "cur_ip": MypvSensorEntityDescription(
+        key="cur_ip",
+        name="IP",
+        icon="mdi:ip-network",
+    ),
+    "cur_sn": MypvSensorEntityDescription(
+        key="cur_sn",
+        name="Serial number",
+        icon="mdi:numeric",
+    ),
+    "cur_gw": MypvSensorEntityDescription(
+        key="cur_gw",
+        name="Gateway",
+        icon="mdi:router-network",
+    ),
+    "cur_dns": MypvSensorEntityDescription(
+        key="cur_dns",
+        name="DNS",
+    ),
+    "fwversionlatest": MypvSensorEntityDescription(
+        key="fwversionlatest",
+        name="latest Firmware version",
+        icon="mdi:numeric",
+        source="firmware",
+    ),
+    "psversionlatest": MypvSensorEntityDescription(
+        key="psversionlatest",
+        name="latest Power supply version",
+        icon="mdi:numeric",
+        source="firmware",
+    ),
+    "p9sversionlatest": MypvSensorEntityDescription(
+        key="p9sversionlatest",
+        name="latest Power supply version Acthor 9",
+        icon="mdi:numeric",
+        source="firmware",
+    ),
+    "upd_state": MypvSensorEntityDescription(
+        key="upd_state",
+        name="Update state",
+        icon="mdi:update",
+    ),
+    "upd_files_left": MypvSensorEntityDescription(
+        key="upd_files_left",
+        name="Update files left",
+        icon="mdi:update",
+    ),
+    "ps_upd_state": MypvSensorEntityDescription(
+        key="ps_upd_state",
+        name="Power supply update state",
+        icon="mdi:update",
+    ),
+    "p9s_upd_state": MypvSensorEntityDescription(
+        key="p9s_upd_state",
+        name="Acthor 9 Power supply update state",
+        icon="mdi:update",
+    ),
+    "cloudstate": MypvSensorEntityDescription(
+        key="cloudstate",
+        name="Cloud Status",
+        icon="mdi:cloud-check",
+    ),
+    "debug_ip": MypvSensorEntityDescription(
+        key="debug_ip",
+        name="Debug IP",
+        icon="mdi:ip-network",
+    ),
+    "mainmode": MypvSensorEntityDescription(
+        key="mainmode",
+        name="Operating Mode",
+        source="setup",
+    ),
     # setup values
-    "mainmode": S("Operating Mode", source="setup"),
-    "mode9s": S("Operating Mode Acthor 9", source="setup"),
+    "mode9s": MypvSensorEntityDescription(
+        key="mode9s",
+        name="Operating Mode Acthor 9",
+        source="setup",
+    ),
+}
+
+
+@dataclass(frozen=True, kw_only=True)
+class MypvBinarySensorEntityDescription(BinarySensorEntityDescription):
+    """Describes a flag or a bit of a data.jsn value."""
+
+    data_key: str
+    # 0 is on for every value but 0
+    mask: int = 0
+
+
+# meter prefix and name of the mNdevstate bitfields
+DEVSTATE_METERS = {
+    "m1": "PV",
+    "m2": "Batterie",
+    "m3": "Ladestation",
+    "m4": "Wärmepumpe",
+}
+# bit and name of the mNdevstate errors
+DEVSTATE_BITS = {
+    "err1": (1, "Lesefehler Meter Register"),
+    "err2": (2, "Lesefehler L1/L2/L3 Register"),
+    "err3": (4, "Lesefehler SoC Register"),
+    "err4": (8, "Lesefehler Status Register"),
+}
+
+BINARY_SENSOR_TYPES = {
+    "boostactive": MypvBinarySensorEntityDescription(
+        key="boostactive",
+        name="Boost active",
+        data_key="boostactive",
+        icon="mdi:thermometer-chevron-up",
+        device_class=BinarySensorDeviceClass.RUNNING,
+    ),
+    "blockactive": MypvBinarySensorEntityDescription(
+        key="blockactive",
+        name="Block active",
+        data_key="blockactive",
+        icon="mdi:timer-lock",
+    ),
+    "act_night_flag": MypvBinarySensorEntityDescription(
+        key="act_night_flag",
+        name="Night flag",
+        data_key="act_night_flag",
+        icon="mdi:weather-night",
+    ),
+    "schicht_flag": MypvBinarySensorEntityDescription(
+        key="schicht_flag",
+        name="Schicht",
+        data_key="schicht_flag",
+    ),
+    "wp_flag": MypvBinarySensorEntityDescription(
+        key="wp_flag",
+        name="wp_flag",
+        data_key="wp_flag",
+        icon="mdi:heat-pump",
+    ),
+    "rel1_out": MypvBinarySensorEntityDescription(
+        key="rel1_out",
+        name="rel1_out",
+        data_key="rel1_out",
+        icon="mdi:electric-switch",
+        device_class=BinarySensorDeviceClass.POWER,
+    ),
+    **{
+        f"{meter}devstate_{error}": MypvBinarySensorEntityDescription(
+            key=f"{meter}devstate_{error}",
+            name=f"{meter_name} {error_name}",
+            data_key=f"{meter}devstate",
+            mask=bit,
+            device_class=BinarySensorDeviceClass.PROBLEM,
+        )
+        for meter, meter_name in DEVSTATE_METERS.items()
+        for error, (bit, error_name) in DEVSTATE_BITS.items()
+    },
 }
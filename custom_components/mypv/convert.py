@@ -0,0 +1,190 @@
+"""Turn the raw values of the MYPV pages into sensor states."""
+
+from functools import lru_cache
+import json
+import logging
+import os
+import sys
+from typing import Any, Callable
+
+from homeassistant.const import (
+    UnitOfElectricCurrent,
+    UnitOfFrequency,
+    UnitOfTemperature,
+)
+
+from .const import SENSOR_TYPES, MYPV_DEVICES, ENUM_SENSORS
+
+_LOGGER = logging.getLogger(__name__)
+
+# the state texts of trans.py, built by scripts/build_catalogue.py
+CATALOGUE = os.path.join(os.path.dirname(__file__), "catalogue.json")
+# other languages are shown in English
+DEFAULT_LANGUAGE = "en"
+
+DEVSTATE_SENSORS = ("m1devstate", "m2devstate", "m3devstate", "m4devstate")
+DEVSTATE_ERRORS = (
+    (1, "info_measure_devstate_err1"),
+    (2, "info_measure_devstate_err2"),
+    (4, "info_measure_devstate_err3"),
+    (8, "info_measure_devstate_err4"),
+)
+
+
+@lru_cache(maxsize=None)
+def load_catalogue() -> dict:
+    """Read the catalogue once, on the first translated state.
+
+    Does I/O, run it in the executor before the converters are built.
+    """
+    with open(CATALOGUE, encoding="utf-8") as file:
+        return json.load(file)
+
+
+def language_index(language: str | None) -> int:
+    """Return the column of the catalogue for a language like de or en-GB."""
+    languages = load_catalogue()["languages"]
+    code = (language or DEFAULT_LANGUAGE).split("-")[0].lower()
+    if code not in languages:
+        code = DEFAULT_LANGUAGE
+    return languages.index(code)
+
+
+def _code(code: str) -> int | str:
+    """Return a code of a translation key like the pages send it."""
+    return int(code) if code.isdigit() else code
+
+
+@lru_cache(maxsize=None)
+def state_table(index: int) -> dict:
+    """Return the translated states of one language.
+
+    Keyed by (sensor type, code), the values are the complete states, so a
+    lookup replaces formatting the key and the state.
+    """
+    catalogue = load_catalogue()["texts"]
+    table = {}
+    for sensor_type in SENSOR_TYPES:
+        if sensor_type in ENUM_SENSORS or sensor_type in DEVSTATE_SENSORS:
+            continue
+        prefix = f"info_{sensor_type}_"
+        for key, texts in catalogue.items():
+            if key.startswith(prefix):
+                code = key[len(prefix) :]
+                table[sensor_type, _code(code)] = code + texts[index]
+    _LOGGER.debug("Built %s translated states for language %s", len(table), index)
+    return table
+
+
+def enum_texts(texts: dict, sensor_type: str, short_model: str | None) -> dict:
+    """Return the texts of the codes of an enum sensor, keyed by code."""
+    prefix, first = ENUM_SENSORS[sensor_type]
+    prefix = prefix.format(model=short_model)
+    return {
+        int(key[len(prefix) :]) + first: value
+        for key, value in texts.items()
+        if key.startswith(prefix) and key[len(prefix) :].isdigit()
+    }
+
+
+def enum_translation_key(sensor_type: str, short_model: str | None) -> str:
+    """Return the translation key of the states of an enum sensor."""
+    if "{model}" in ENUM_SENSORS[sensor_type][0]:
+        return f"{sensor_type}_{short_model}"
+    return sensor_type
+
+
+@lru_cache(maxsize=None)
+def enum_states(sensor_type: str, model: str) -> dict | None:
+    """Return the option of every code of an enum sensor.
+
+    None if the sensor isn't an enum or there are no texts for the model.
+    The options are interned, a poll doesn't create a new state string.
+    """
+    if sensor_type not in ENUM_SENSORS:
+        return None
+    short_model = MYPV_DEVICES.get(model)
+    if "{model}" in ENUM_SENSORS[sensor_type][0] and short_model is None:
+        _LOGGER.debug("No %s texts for model %s", sensor_type, model)
+        return None
+    codes = enum_texts(load_catalogue()["texts"], sensor_type, short_model)
+    return {code: sys.intern(str(code)) for code in sorted(codes)} or None
+
+
+@lru_cache(maxsize=None)
+def devstate_table(index: int) -> tuple:
+    """Return the error text of the lowest bit set, for all four bits."""
+    catalogue = load_catalogue()["texts"]
+    table = [None] * 16
+    for value in range(1, 16):
+        bit, key = next((bit, key) for bit, key in DEVSTATE_ERRORS if value & bit)
+        table[value] = catalogue[key][index]
+    return tuple(table)
+
+
+def state_converter(
+    sensor_type: str, model: str, language: str | None
+) -> Callable[[dict], Any]:
+    """Return the function building the state of a sensor from its page.
+
+    Everything depending on the sensor type, the device model and the
+    language is resolved here once, the function only reads and scales
+    the value or looks it up.
+    """
+    index = language_index(language)
+    unit = SENSOR_TYPES[sensor_type].native_unit_of_measurement
+
+    if sensor_type == "power_act":
+
+        def convert(data: dict) -> Any:
+            state = data[sensor_type]
+            if state is None:
+                return None
+            return int(data["rel1_out"]) * int(data["load_nom"]) + int(state)
+
+        return convert
+
+    scale = None
+    if unit == UnitOfFrequency.HERTZ:
+        scale = 1000
+    elif unit == UnitOfTemperature.CELSIUS and sensor_type != "tempchip":
+        scale = 10
+    elif unit == UnitOfElectricCurrent.AMPERE:
+        scale = 10
+    if scale is not None:
+
+        def convert(data: dict) -> Any:
+            state = data[sensor_type]
+            return state / scale if state is not None else None
+
+        return convert
+
+    if sensor_type in DEVSTATE_SENSORS:
+        errors = devstate_table(index)
+
+        def convert(data: dict) -> Any:
+            state = data[sensor_type]
+            text = errors[state & 15] if state is not None else None
+            return str(state) + text if text is not None else state
+
+        return convert
+
+    if (states := enum_states(sensor_type, model)) is not None:
+
+        def convert(data: dict) -> Any:
+            state = data[sensor_type]
+            if state is None or state in states:
+                return states.get(state)
+            # e.g. a code of a newer firmware, shown as is
+            _LOGGER.warning("No text for %s %s of %s", sensor_type, state, model)
+            return str(state)
+
+        return convert
+
+    table = state_table(index)
+
+    def convert(data: dict) -> Any:
+        state = data[sensor_type]
+        return table.get((sensor_type, state), state)
+
+    return convert
@@ -1,99 +1,801 @@
-"""Provides the MYPV DataUpdateCoordinator."""
+"""Provides the MYPV DataUpdateCoordinators."""
 
+import asyncio
 from datetime import timedelta
+import hashlib
 import logging
-import requests
-import json
+import time
+from typing import Callable
+
+import aiohttp
 
-from async_timeout import timeout
 from homeassistant.util.dt import utcnow
-from homeassistant.const import CONF_HOST
+from homeassistant.const import CONF_HOST, CONF_MONITORED_CONDITIONS
+from homeassistant.core import CALLBACK_TYPE, callback
+from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.typing import HomeAssistantType
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
-from .const import DOMAIN
+from .api import MypvApi, async_pop_probe, json_loads
+from .breaker import CircuitBreaker, PageRetry
+from .discovery import async_discover
+from .firmware import async_get_firmware_checker
+from .modbus import ModbusError, MypvModbus
+from .scheduler import async_get_scheduler
+from .const import (
+    DOMAIN,
+    SENSOR_TYPES,
+    MYPV_DEVICES,
+    BINARY_SENSOR_TYPES,
+    PAGE_TIMEOUTS,
+    ACTIVITY_KEYS,
+    DEFAULT_MIN_INTERVAL,
+    DEFAULT_MAX_INTERVAL,
+    DEFAULT_MODBUS_PORT,
+    MODBUS_JSON_INTERVAL,
+    BREAKER_THRESHOLD,
+    BREAKER_BACKOFF,
+    BREAKER_MAX_BACKOFF,
+    PAGE_RETRY_BACKOFF,
+    PAGE_RETRY_MAX_BACKOFF,
+    SNAPSHOT_STORAGE_VERSION,
+    SNAPSHOT_SAVE_DELAY,
+    RELOCATE_AFTER,
+    RELOCATE_INTERVAL,
+    SETUP_REFRESH_INTERVAL,
+    SETUP_TRIGGER_KEYS,
+    EVENT_SETUP_CHANGED,
+    FIRMWARE_RETRY,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
 
-class MYPVDataUpdateCoordinator(DataUpdateCoordinator):
-    """Class to manage fetching MYPV data."""
+@callback
+def snapshot_store(hass: HomeAssistantType, entry_id: str) -> Store:
+    """Return the store of the last device snapshot of an entry."""
+    return Store(hass, SNAPSHOT_STORAGE_VERSION, f"{DOMAIN}.{entry_id}")
+
+
+def selected_sensors(config: dict, options: dict) -> list:
+    """Return the sensor types selected for an entry."""
+    if options.get("use_all_sensors"):
+        return list(SENSOR_TYPES)
+    return options.get(
+        CONF_MONITORED_CONDITIONS, config.get(CONF_MONITORED_CONDITIONS, [])
+    )
+
+
+def available_sensors(device: "MypvDeviceInfo", config: dict, options: dict) -> list:
+    """Return the selected sensor types the device can fill.
+
+    All sensors is narrowed down to the keys the pages sent, a sensor picked
+    by the user is always created.
+    """
+    sensors = selected_sensors(config, options)
+    if not options.get("use_all_sensors"):
+        return sensors
+    return [sensor for sensor in sensors if device.supports(sensor)]
+
+
+def projected_keys(config: dict, options: dict) -> frozenset:
+    """Return the data.jsn keys the entities of an entry are built from."""
+    keys = set()
+    for sensor in selected_sensors(config, options):
+        if sensor in SENSOR_TYPES and SENSOR_TYPES[sensor].source == "data":
+            keys.add(sensor)
+            keys.update(SENSOR_TYPES[sensor].depends)
+    keys.update(SETUP_TRIGGER_KEYS)
+    if options.get("adaptive_polling"):
+        keys.update(ACTIVITY_KEYS)
+        keys.add("act_night_flag")
+    return frozenset(keys)
+
+
+class MypvDeviceInfo:
+    """Static info of a device and the state its coordinators share."""
+
+    def __init__(self, hass: HomeAssistantType, host: str, entry_id: str = None):
+        """Initialize the device."""
+        self.entry_id = entry_id
+        self.api = MypvApi(hass, host)
+        self.breaker = CircuitBreaker(
+            BREAKER_THRESHOLD, BREAKER_BACKOFF, BREAKER_MAX_BACKOFF
+        )
+        self.retries = {
+            page: PageRetry(PAGE_RETRY_BACKOFF, PAGE_RETRY_MAX_BACKOFF)
+            for page in PAGE_TIMEOUTS
+        }
+        # a config flow which just created the entry already read mypv_dev.jsn
+        self.info = async_pop_probe(hass, host)
+        # the info of a snapshot is read again by the first live poll
+        self.restored = False
+        # source -> coordinator of the entities reading that source
+        self.coordinators = {}
+        self._store = snapshot_store(hass, entry_id) if entry_id else None
+
+    @property
+    def host(self) -> str:
+        """Return the current address of the device."""
+        return self.api.host
+
+    @property
+    def serial(self) -> str | None:
+        """Return the serial number of the device."""
+        return self.info["sn"] if self.info is not None else None
+
+    def supports(self, sensor_type: str) -> bool:
+        """Return True if the device sends the value of a sensor type.
+
+        The last snapshot of the page decides, the models the sensor is
+        documented for only if the page wasn't read yet.
+        """
+        description = SENSOR_TYPES[sensor_type]
+        coordinator = self.coordinators.get(description.source)
+        if coordinator is not None and coordinator.data is not None:
+            return sensor_type in coordinator.data
+        models = description.device.split()
+        return not models or MYPV_DEVICES.get(self.info["device"]) in models
+
+    def device_info(self, name: str) -> DeviceInfo:
+        """Return the device registry info of the device."""
+        return DeviceInfo(
+            identifiers={(DOMAIN, self.serial)},
+            manufacturer="MYPV",
+            model=self.info["device"],
+            name=name,
+            sw_version=self.info["fwversion"],
+            hw_version=None,
+        )
+
+    @property
+    def snapshot(self) -> dict:
+        """Return the info and the data of every coordinator."""
+        return {
+            "info": self.info,
+            **{
+                source: coordinator.data
+                for source, coordinator in self.coordinators.items()
+            },
+        }
+
+    async def async_restore(self) -> bool:
+        """Load the last persisted snapshot as coordinator data.
+
+        Returns False if there is none, entities can be created right away
+        otherwise.
+        """
+        if self._store is None or (snapshot := await self._store.async_load()) is None:
+            return False
+        self.info = snapshot["info"]
+        self.restored = True
+        for source, coordinator in self.coordinators.items():
+            coordinator.data = snapshot.get(source)
+        return True
+
+    @callback
+    def async_save_snapshot(self) -> None:
+        """Persist the data of the last polls, at most once a minute."""
+        if self._store is not None:
+            self._store.async_delay_save(lambda: self.snapshot, SNAPSHOT_SAVE_DELAY)
+
+    async def async_close(self) -> None:
+        """Close the session and the coordinators of the device."""
+        await self.api.async_close()
+        for coordinator in self.coordinators.values():
+            await coordinator.async_close()
+
+
+def decode_flags(data: dict) -> dict:
+    """Return the state of every binary sensor whose key is in data."""
+    flags = {}
+    for binary_type, sensor in BINARY_SENSOR_TYPES.items():
+        value = data.get(sensor.data_key)
+        if value is None:
+            continue
+        try:
+            flags[binary_type] = bool(value & sensor.mask if sensor.mask else value)
+        except TypeError:
+            _LOGGER.debug("%s is not a bitfield: %s", sensor.data_key, value)
+    return flags
+
+
+def changed_keys(old: dict | None, new: dict | None) -> set:
+    """Return the keys whose value differs between two pages."""
+    if new is old:
+        return set()
+    old = old or {}
+    new = new or {}
+    # a key that appears or vanishes changed, even if its value is None
+    return {
+        key
+        for key in old.keys() | new.keys()
+        if key not in old or key not in new or old[key] != new[key]
+    }
 
-    def __init__(self, hass: HomeAssistantType, *, config: dict, options: dict) -> None:
-        """Initialize global NZBGet data updater."""
-        self._host = config[CONF_HOST]
-        self._info = None
-        self._setup = None
-        self._firmware = None
-        self._next_update = 0
-        self._next_update_firmware = 0
-        self.update_interval = timedelta(seconds=10)
 
+@callback
+def async_track_new_sensors(
+    device: "MypvDeviceInfo",
+    sensors: set,
+    async_add_sensors: Callable[[list], None],
+) -> CALLBACK_TYPE:
+    """Call back with the sensor types the device starts sending.
+
+    Only the keys of the given sensor types wake the tracker, every type is
+    reported once. Returns the unsubscriber.
+    """
+    pending = {}
+    for sensor in sensors:
+        pending.setdefault(SENSOR_TYPES[sensor].source, set()).add(sensor)
+    unsubscribers = {}
+
+    @callback
+    def async_track(source: str) -> None:
+        """Listen to the keys of the sensor types of a page still missing."""
+        if pending[source]:
+            unsubscribers[source] = device.coordinators[source].async_add_listener(
+                lambda: async_check(source), frozenset(pending[source])
+            )
+
+    @callback
+    def async_check(source: str) -> None:
+        """Report the sensor types the last read of a page added."""
+        found = [sensor for sensor in pending[source] if device.supports(sensor)]
+        if not found:
+            return
+        _LOGGER.debug("%s sends new values: %s", device.host, found)
+        pending[source].difference_update(found)
+        unsubscribe = unsubscribers.pop(source)
+        async_track(source)
+        unsubscribe()
+        async_add_sensors(found)
+
+    @callback
+    def async_unsubscribe() -> None:
+        """Stop tracking the sensor types."""
+        while unsubscribers:
+            unsubscribers.popitem()[1]()
+
+    for source in pending:
+        async_track(source)
+    return async_unsubscribe
+
+
+class MypvPageCoordinator(DataUpdateCoordinator):
+    """Base of the coordinators reading the pages of one device."""
+
+    def __init__(
+        self,
+        hass: HomeAssistantType,
+        device: MypvDeviceInfo,
+        *,
+        name: str,
+        update_interval: timedelta,
+    ) -> None:
+        """Initialize the coordinator."""
+        self.device = device
+        self._scheduler = async_get_scheduler(hass)
+        # page -> (digest of the raw body, parsed body)
+        self._pages = {}
+        # keys changed by the last poll, None notifies everyone
+        self._changed_keys = None
+        self.stats = {
+            "polls": 0,
+            "unchanged_polls": 0,
+            "page_fetches": 0,
+            "page_hash_hits": 0,
+        }
+
+        # an unchanged poll returns the previous data object, which
+        # always_update=False turns into a poll without listener callbacks
         super().__init__(
             hass,
             _LOGGER,
-            name=DOMAIN,
-            update_interval=self.update_interval,
+            name=name,
+            update_interval=update_interval,
+            always_update=False,
+        )
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update the listeners bound to a changed key.
+
+        Entities subscribe with a set of keys as context, listeners without
+        context are always updated.
+        """
+        changed = self._changed_keys
+        self._changed_keys = None
+        if changed is None:
+            super().async_update_listeners()
+            return
+        for update_callback, context in list(self._listeners.values()):
+            if context is None or not changed.isdisjoint(context):
+                update_callback()
+
+    async def json_update(self, page: str, keys: frozenset = None) -> dict:
+        """Read one page within its deadline.
+
+        A body that hashes like the previous one returns the already parsed
+        snapshot of that page, which is reduced to the given keys.
+        """
+        retry = self.device.retries[page]
+        try:
+            # the deadline starts once a fleet request slot is free
+            body = await self.device.api.async_get_body(page)
+            self.stats["page_fetches"] += 1
+            digest = hashlib.blake2b(body, digest_size=16).digest()
+            cached = self._pages.get(page)
+            if cached is not None and cached[0] == digest:
+                self.stats["page_hash_hits"] += 1
+                retry.success()
+                return cached[1]
+            # a truncated or garbled body is a failed read of the page
+            data = json_loads(body)
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError):
+            retry.failure()
+            raise
+        retry.success()
+        if keys is not None:
+            data = {key: data[key] for key in keys if key in data}
+        _LOGGER.debug(data)
+        self._pages[page] = (digest, data)
+        return data
+
+    @property
+    def diagnostics(self) -> dict:
+        """Return the poll statistics."""
+        stats = self.stats
+        return {
+            **stats,
+            "page_hash_hit_rate": (
+                stats["page_hash_hits"] / stats["page_fetches"]
+                if stats["page_fetches"]
+                else None
+            ),
+            "unchanged_poll_rate": (
+                stats["unchanged_polls"] / stats["polls"] if stats["polls"] else None
+            ),
+        }
+
+    async def async_close(self) -> None:
+        """Release the resources of the coordinator."""
+
+
+class MYPVDataUpdateCoordinator(MypvPageCoordinator):
+    """Class to manage fetching MYPV live data."""
+
+    def __init__(
+        self,
+        hass: HomeAssistantType,
+        device: MypvDeviceInfo,
+        *,
+        config: dict,
+        options: dict,
+    ) -> None:
+        """Initialize the live data updater."""
+        self.options = options
+        self._modbus = None
+        if options.get("transport") == "modbus":
+            self._modbus = MypvModbus(
+                device.host.split(":")[0],
+                options.get("modbus_port", DEFAULT_MODBUS_PORT),
+            )
+        # last data.jsn and register values of the Modbus transport
+        self._data_json = None
+        self._data_modbus = None
+        self._next_update_data = 0
+        # data.jsn only keeps the keys somebody reads
+        self._data_keys = projected_keys(config, options)
+        # binary sensor states, decoded once per changed data object
+        self._flags = {}
+        self._flags_data = None
+        self._flag_keys = frozenset(
+            sensor.data_key for sensor in BINARY_SENSOR_TYPES.values()
+        )
+        self._polling = False
+        self._outage_started = None
+        self._next_relocate = 0.0
+        self._adaptive = options.get("adaptive_polling", False)
+        self._min_interval = timedelta(
+            seconds=options.get("min_interval", DEFAULT_MIN_INTERVAL)
+        )
+        self._max_interval = timedelta(
+            seconds=options.get("max_interval", DEFAULT_MAX_INTERVAL)
+        )
+
+        super().__init__(
+            hass, device, name=DOMAIN, update_interval=timedelta(seconds=10)
+        )
+        self._base_interval = self.update_interval
+        self.stats.update(
+            skipped_polls=0,
+            relocations=0,
+            last_time_to_recovery=None,
         )
 
     async def _async_update_data(self) -> dict:
-        """Fetch data from NZBGet."""
-
-        def _update_data() -> dict:
-            """Fetch data from NZBGet via sync functions."""
-            data = self.json_update("data")
-            if self._info is None:
-                self._info = self.json_update("mypv_dev")
-
-            if self._setup is None or self._next_update < utcnow().timestamp():
-                self._next_update = utcnow().timestamp() + 120  # 86400
-                self._setup = self.json_update("setup")
-
-            if (
-                self._firmware is None
-                or self._next_update_firmware < utcnow().timestamp()
-            ):
-                self._next_update_firmware = utcnow().timestamp() + (7 * 86400)
-                # @todo self._firmware = self.firmware_update()
-
-            return {
-                "data": data,
-                "info": self._info,
-                "setup": self._setup,
-                "firmware": self._firmware,
-            }
+        """Fetch data from the device web server."""
+        if self.data is not None and self.device.breaker.allow():
+            # sleeping until the slot of the device isn't a running poll
+            await self._scheduler.async_wait_for_slot(
+                self.device.serial, self.update_interval
+            )
+        if self._polling:
+            # a refresh while the previous poll still runs is dropped
+            self.stats["skipped_polls"] += 1
+            if self.data is None or not self.last_update_success:
+                raise UpdateFailed(f"A poll of {self.host} is already running")
+            return self.data
+        self._polling = True
+        try:
+            data = await self._async_poll()
+        except UpdateFailed:
+            self._async_track_outage()
+            raise
+        finally:
+            self._polling = False
+        if self._outage_started is not None:
+            recovery = time.monotonic() - self._outage_started
+            self._outage_started = None
+            self.stats["last_time_to_recovery"] = round(recovery, 1)
+        return data
+
+    @callback
+    def _async_track_outage(self) -> None:
+        """Search the device in its subnet once it is gone for a while."""
+        now = time.monotonic()
+        if self._outage_started is None:
+            self._outage_started = now
+        if (
+            now - self._outage_started < RELOCATE_AFTER
+            or now < self._next_relocate
+            or self.device.entry_id is None
+            or self.device.info is None
+        ):
+            return
+        self._next_relocate = now + RELOCATE_INTERVAL
+        self.hass.async_create_background_task(
+            self._async_relocate(), f"{DOMAIN} relocate {self.host}"
+        )
 
+    async def _async_relocate(self) -> None:
+        """Find the serial number under another address and move the entry."""
+        old_host = self.host
+        address, _, port = old_host.partition(":")
         try:
-            async with timeout(4):
-                return await self.hass.async_add_executor_job(_update_data)
-        except Exception as error:
-            raise UpdateFailed(f"Invalid response from API: {error}") from error
+            devices = await async_discover(
+                self.hass, f"{address}/24", int(port) if port else 80
+            )
+        except ValueError:
+            # not an ip address
+            return
+        serial = self.device.serial
+        host = next(
+            (host for host, info in devices.items() if info["sn"] == serial), None
+        )
+        entry = self.hass.config_entries.async_get_entry(self.device.entry_id)
+        if host is None or host == old_host or entry is None:
+            _LOGGER.debug("Device %s not found around %s", serial, old_host)
+            return
+
+        _LOGGER.warning("Device %s moved from %s to %s", serial, old_host, host)
+        api = self.device.api
+        await api.async_close()
+        api.host = host
+        if self._modbus is not None:
+            await self._modbus.async_close()
+            self._modbus.host = host.partition(":")[0]
+        self.stats["relocations"] += 1
+        # the update listener doesn't reload the entry for a new host
+        self.hass.config_entries.async_update_entry(
+            entry, data={**entry.data, CONF_HOST: host}
+        )
+        self.device.breaker.success()
+        await self.async_refresh()
+
+    async def _async_poll(self) -> dict:
+        """Poll the live values and a missing device info."""
+        self._changed_keys = None
+        device = self.device
+        if not device.breaker.allow():
+            raise UpdateFailed(
+                f"{self.host} is unreachable, "
+                f"next probe in {device.breaker.retry_in:.0f} s"
+            )
+
+        now = utcnow().timestamp()
+        due = {
+            "data": self._modbus is None or self._next_update_data < now,
+            "mypv_dev": device.info is None or device.restored,
+        }
+        # the live values are always read, the breaker guards them
+        live = "data" if self._modbus is None else "modbus"
+
+        # every page runs against its own deadline, so the poll takes as long
+        # as the slowest page
+        fetches = {
+            page: self.json_update(page, self._data_keys if page == "data" else None)
+            for page, wanted in due.items()
+            if wanted and (page == live or device.retries[page].due())
+        }
+        if self._modbus is not None:
+            fetches["modbus"] = self.modbus_update()
+        results = dict(
+            zip(
+                fetches,
+                await asyncio.gather(*fetches.values(), return_exceptions=True),
+            )
+        )
+
+        # the breaker only follows the live values
+        if isinstance(results[live], Exception):
+            device.breaker.failure()
+        else:
+            device.breaker.success()
+
+        if self._modbus is None:
+            data = results["data"]
+            if isinstance(data, Exception):
+                raise UpdateFailed(f"Invalid response from API: {data}") from data
+        else:
+            data = self._merge_modbus(results)
+
+        info = results.get("mypv_dev")
+        if isinstance(info, Exception):
+            _LOGGER.debug("Reading mypv_dev.jsn from %s failed: %s", self.host, info)
+        elif info is not None:
+            device.info = info
+            device.restored = False
+        if device.info is None:
+            raise UpdateFailed(f"Device info of {self.host} is not available")
+
+        self.stats["polls"] += 1
+        if self.data is None or not self.last_update_success:
+            # first data or recovery, every entity has to write its state
+            self._changed_keys = None
+            if self._adaptive:
+                self.update_interval = self._base_interval
+            device.async_save_snapshot()
+            return data
+
+        self._changed_keys = changed_keys(self.data, data)
+        if not self._changed_keys.isdisjoint(self._flag_keys):
+            # binary sensors only wake up on an edge of their own bit
+            old_flags = self.flags
+            new_flags = decode_flags(data)
+            self._changed_keys.update(
+                ("binary_sensor", binary_type)
+                for binary_type in old_flags.keys() | new_flags.keys()
+                if old_flags.get(binary_type) != new_flags.get(binary_type)
+            )
+            self._flags, self._flags_data = new_flags, data
+        if self._adaptive:
+            self._adapt_interval(data)
+        if not self._changed_keys:
+            self.stats["unchanged_polls"] += 1
+            return self.data
+        device.async_save_snapshot()
+        return data
+
+    def _adapt_interval(self, data: dict) -> None:
+        """Pick the next polling interval from the device activity.
+
+        Changing power or status values poll at the minimum interval, an idle
+        device at night backs off exponentially up to the maximum interval,
+        anything else returns to the configured interval.
+        """
+        interval = self.update_interval
+        if not self._changed_keys.isdisjoint(ACTIVITY_KEYS):
+            interval = self._min_interval
+        elif (
+            data.get("act_night_flag")
+            and not data.get("power")
+            and not data.get("power_act")
+            and not data.get("boostactive")
+        ):
+            interval = min(interval * 2, self._max_interval)
+        elif interval < self._base_interval:
+            interval = min(interval * 2, self._base_interval)
+        else:
+            interval = self._base_interval
+        if interval != self.update_interval:
+            _LOGGER.debug("Polling %s every %s", self.host, interval)
+            self.update_interval = interval
+
+    @property
+    def flags(self) -> dict:
+        """Return the binary sensor states of the current data."""
+        if self._flags_data is not self.data:
+            self._flags = decode_flags(self.data or {})
+            self._flags_data = self.data
+        return self._flags
 
     def set_interval(self, new_interval: int):
         """Update polling interval."""
         self.update_interval = timedelta(seconds=new_interval)
+        self._base_interval = self.update_interval
+
+    def _merge_modbus(self, results: dict) -> dict:
+        """Overlay the register values on the last data.jsn."""
+        live = results["modbus"]
+        if isinstance(live, Exception):
+            raise UpdateFailed(f"Invalid response from Modbus: {live}") from live
 
-    def json_update(self, page: str):
-        """Update inverter data."""
+        base = results.get("data")
+        if isinstance(base, Exception):
+            _LOGGER.debug("Reading data.jsn from %s failed: %s", self.host, base)
+        elif base is not None:
+            self._next_update_data = utcnow().timestamp() + MODBUS_JSON_INTERVAL
+            self._data_json = base
+
+        previous = self.data
+        if previous is not None and base is None and live == self._data_modbus:
+            return previous
+        self._data_modbus = live
+        return {**(self._data_json or {}), **live}
+
+    async def modbus_update(self) -> dict:
+        """Read the live values over Modbus TCP within their deadline."""
+        retry = self.device.retries["modbus"]
         try:
-            response = requests.get(f"http://{self._host}/{page}.jsn", timeout=10)
-            data = json.loads(response.text)
-            _LOGGER.debug(data)
-            return data
-        except:
-            pass
+            async with self._scheduler.async_request():
+                async with asyncio.timeout(PAGE_TIMEOUTS["modbus"]):
+                    data = await self._modbus.async_read_data()
+        except (ModbusError, asyncio.TimeoutError):
+            retry.failure()
+            raise
+        retry.success()
+        return data
 
-    def firmware_update(self):
-        """read the firmware info"""
+    @property
+    def diagnostics(self) -> dict:
+        """Return the poll statistics and the state of the device."""
+        device = self.device
+        return {
+            **super().diagnostics,
+            "joined_requests": device.api.joined_requests,
+            "breaker": device.breaker.diagnostics,
+            "pages": {
+                page: retry.diagnostics for page, retry in device.retries.items()
+            },
+        }
+
+    @property
+    def host(self) -> str:
+        """Return the current address of the device."""
+        return self.device.host
+
+    async def async_close(self) -> None:
+        """Close the Modbus connection and free the poll slot of the device."""
+        if self.device.serial is not None:
+            self._scheduler.async_remove(self.device.serial)
+        if self._modbus is not None:
+            await self._modbus.async_close()
+
+
+class MypvSetupCoordinator(MypvPageCoordinator):
+    """Class to manage reading the settings of a MYPV device."""
+
+    def __init__(self, hass: HomeAssistantType, device: MypvDeviceInfo) -> None:
+        """Initialize the setup updater."""
+        self._refresh_interval = timedelta(seconds=SETUP_REFRESH_INTERVAL)
+        super().__init__(
+            hass,
+            device,
+            name=f"{DOMAIN} setup",
+            update_interval=self._refresh_interval,
+        )
+
+    async def _async_update_data(self) -> dict:
+        """Read setup.jsn, a failed read keeps the last settings."""
+        self._changed_keys = None
+        device = self.device
+        retry = device.retries["setup"]
         try:
-            response = requests.get(
-                "https://www.my-pv.com/download/currentversion.php?sn="
-                + self._info.get("sn"),
-                timeout=10,
+            if not device.breaker.allow() or not retry.due():
+                raise UpdateFailed(f"{device.host} is backing off")
+            setup = await self.json_update("setup")
+        except (
+            aiohttp.ClientError,
+            asyncio.TimeoutError,
+            ValueError,
+            UpdateFailed,
+        ) as error:
+            # try again once the device or the page backoff allows it
+            self.update_interval = timedelta(
+                seconds=max(device.breaker.retry_in, retry.retry_in, PAGE_RETRY_BACKOFF)
+            )
+            if self.data is None:
+                raise UpdateFailed(
+                    f"Reading setup.jsn from {device.host} failed: {error}"
+                ) from error
+            _LOGGER.debug("Reading setup.jsn from %s failed: %s", device.host, error)
+            return self.data
+        self.update_interval = self._refresh_interval
+
+        self.stats["polls"] += 1
+        if self.data is None or not self.last_update_success:
+            self._changed_keys = None
+            device.async_save_snapshot()
+            return setup
+
+        self._changed_keys = changed_keys(self.data, setup)
+        if not self._changed_keys:
+            self.stats["unchanged_polls"] += 1
+            return self.data
+        self._async_fire_setup_changes(self.data, setup)
+        device.async_save_snapshot()
+        return setup
+
+    @callback
+    def _async_fire_setup_changes(self, old: dict, new: dict) -> None:
+        """Fire an event listing the setup keys which changed."""
+        self.hass.bus.async_fire(
+            EVENT_SETUP_CHANGED,
+            {
+                "entry_id": self.device.entry_id,
+                "serial": self.device.serial,
+                "changes": {
+                    key: {"old": old.get(key), "new": new.get(key)}
+                    for key in self._changed_keys
+                },
+            },
+        )
+
+    @callback
+    def async_mode_changed(self) -> None:
+        """Read setup.jsn again after the device changed its mode."""
+        self.hass.async_create_background_task(
+            self.async_request_refresh(), f"{DOMAIN} setup {self.device.host}"
+        )
+
+    async def async_refresh_setup(self) -> None:
+        """Read setup.jsn right away, e.g. after writing a setting."""
+        self.device.retries["setup"].success()
+        await self.async_request_refresh()
+
+
+class MypvFirmwareCoordinator(DataUpdateCoordinator):
+    """Class to publish the latest firmware versions of a MYPV device."""
+
+    def __init__(self, hass: HomeAssistantType, device: MypvDeviceInfo) -> None:
+        """Initialize the firmware updater."""
+        self.device = device
+        self._checker = async_get_firmware_checker(hass)
+        self._unsubscribe = None
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=f"{DOMAIN} firmware",
+            update_interval=timedelta(seconds=FIRMWARE_RETRY),
+            always_update=False,
+        )
+
+    async def _async_update_data(self) -> dict | None:
+        """Return the cached versions, the checker queries the my-PV server."""
+        serial = self.device.serial
+        if serial is None:
+            raise UpdateFailed(f"Device info of {self.device.host} is not available")
+        if self._unsubscribe is None:
+            self._unsubscribe = self._checker.async_listen(
+                serial, self._async_firmware_checked
             )
-            info = json.loads(response.text)
-            _LOGGER.debug(info)
-            return info
-        except:
-            _LOGGER.error("Mypv update firmware failed. postpone")
-            return json.loads("{}")
+        # a valid cached result is published right away after a restart
+        await self._checker.async_load()
+        return self._checker.async_get(serial)
+
+    @callback
+    def _async_firmware_checked(self) -> None:
+        """Publish the result of a finished lookup."""
+        firmware = self._checker.async_get(self.device.serial)
+        if firmware != self.data:
+            self.async_set_updated_data(firmware)
+            self.device.async_save_snapshot()
+
+    async def async_close(self) -> None:
+        """Stop listening to the firmware checker."""
+        if self._unsubscribe is not None:
+            self._unsubscribe()
+            self._unsubscribe = None
@@ -0,0 +1,25 @@
+"""Diagnostics support for MYPV."""
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN, DATA_COORDINATOR, DATA_DEVICE
+from .scheduler import async_get_scheduler
+
+TO_REDACT = {"sn", "cur_sn"}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict:
+    """Return diagnostics for a config entry."""
+    entry_data = hass.data[DOMAIN][entry.entry_id]
+    device = entry_data[DATA_DEVICE]
+    return {
+        "entry": {"data": dict(entry.data), "options": dict(entry.options)},
+        "coordinator": entry_data[DATA_COORDINATOR].diagnostics,
+        "setup": device.coordinators["setup"].diagnostics,
+        "fleet": async_get_scheduler(hass).diagnostics,
+        "data": async_redact_data(device.snapshot, TO_REDACT),
+    }
@@ -0,0 +1,57 @@
+"""Discovery of MYPV devices in a local network."""
+
+import asyncio
+import ipaddress
+import logging
+
+import aiohttp
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+from .api import json_loads
+from .const import DISCOVERY_CONCURRENCY, DISCOVERY_MAX_HOSTS, DISCOVERY_TIMEOUT
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def discovery_hosts(ip_range: str, port: int = 80) -> list:
+    """Return the hosts of an ip range like 192.168.0.0/24."""
+    network = ipaddress.ip_network(ip_range, strict=False)
+    if network.num_addresses > DISCOVERY_MAX_HOSTS:
+        raise ValueError(f"{ip_range} has more than {DISCOVERY_MAX_HOSTS} addresses")
+    addresses = list(network.hosts()) or [network.network_address]
+    if port == 80:
+        return [str(address) for address in addresses]
+    return [f"{address}:{port}" for address in addresses]
+
+
+async def async_discover(hass: HomeAssistant, ip_range: str, port: int = 80) -> dict:
+    """Probe every host of an ip range for mypv_dev.jsn at once.
+
+    Works like the device search of the my-PV web setup, returns the device
+    info keyed by host for every responding unit.
+    """
+    session = async_get_clientsession(hass)
+    semaphore = asyncio.Semaphore(DISCOVERY_CONCURRENCY)
+    timeout = aiohttp.ClientTimeout(total=DISCOVERY_TIMEOUT)
+
+    async def _async_probe(host: str) -> dict | None:
+        """Return the device info of one host."""
+        async with semaphore:
+            try:
+                async with session.get(
+                    f"http://{host}/mypv_dev.jsn", timeout=timeout
+                ) as response:
+                    info = json_loads(await response.read())
+            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError):
+                return None
+        if not isinstance(info, dict) or "sn" not in info:
+            return None
+        return info
+
+    hosts = discovery_hosts(ip_range, port)
+    results = await asyncio.gather(*(_async_probe(host) for host in hosts))
+    devices = {host: info for host, info in zip(hosts, results) if info is not None}
+    _LOGGER.debug("Found %s devices in %s", len(devices), ip_range)
+    return devices
@@ -0,0 +1,151 @@
+"""Background lookup of the latest MYPV firmware versions."""
+
+import asyncio
+import logging
+import time
+
+import aiohttp
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.storage import Store
+
+from .api import json_loads
+from .const import (
+    DOMAIN,
+    DATA_FIRMWARE,
+    FIRMWARE_URL,
+    FIRMWARE_KEYS,
+    FIRMWARE_TTL,
+    FIRMWARE_RETRY,
+    FIRMWARE_REQUEST_SPACING,
+    FIRMWARE_TIMEOUT,
+    FIRMWARE_STORAGE_VERSION,
+    FIRMWARE_SAVE_DELAY,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@callback
+def async_get_firmware_checker(
+    hass: HomeAssistant, url: str = None
+) -> "MypvFirmwareChecker":
+    """Return the checker shared by all config entries."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if DATA_FIRMWARE not in domain_data:
+        domain_data[DATA_FIRMWARE] = MypvFirmwareChecker(hass, url or FIRMWARE_URL)
+    return domain_data[DATA_FIRMWARE]
+
+
+class MypvFirmwareChecker:
+    """Look up the latest firmware of every serial number, one at a time.
+
+    Results are cached on disk, so a restart doesn't query the my-PV server
+    again before FIRMWARE_TTL has passed. Lookups never run inside a poll.
+    """
+
+    def __init__(self, hass: HomeAssistant, url: str) -> None:
+        """Initialize the checker."""
+        self._hass = hass
+        self.url = url
+        self._store = Store(hass, FIRMWARE_STORAGE_VERSION, f"{DOMAIN}.firmware")
+        # serial -> {"expires": unix time, "result": normalized response}
+        self._cache = None
+        self._loading = asyncio.Lock()
+        self._queue = asyncio.Queue()
+        self._queued = set()
+        self._worker = None
+        # serial -> callbacks run once a lookup of that serial finished
+        self._listeners = {}
+
+    async def async_load(self) -> None:
+        """Read the cached lookups from disk, once."""
+        async with self._loading:
+            if self._cache is None:
+                self._cache = await self._store.async_load() or {}
+
+    @callback
+    def async_get(self, serial: str) -> dict | None:
+        """Return the cached versions of a serial and queue an expired one."""
+        entry = self._cache.get(serial) if self._cache is not None else None
+        if entry is not None and time.time() < entry["expires"]:
+            return entry["result"]
+        if serial not in self._queued:
+            self._queued.add(serial)
+            self._queue.put_nowait(serial)
+        if self._worker is None:
+            self._worker = self._hass.async_create_background_task(
+                self._async_work(), f"{DOMAIN} firmware checker"
+            )
+        return entry["result"] if entry is not None else None
+
+    @callback
+    def async_listen(
+        self, serial: str, update_callback: CALLBACK_TYPE
+    ) -> CALLBACK_TYPE:
+        """Call back after every lookup of a serial, returns the unsubscriber."""
+        listeners = self._listeners.setdefault(serial, set())
+        listeners.add(update_callback)
+
+        @callback
+        def _async_remove() -> None:
+            listeners.discard(update_callback)
+
+        return _async_remove
+
+    async def _async_work(self) -> None:
+        """Process the queued serial numbers."""
+        await self.async_load()
+        while True:
+            serial = await self._queue.get()
+            entry = self._cache.get(serial)
+            try:
+                if entry is None or time.time() >= entry["expires"]:
+                    await self._async_check(serial, entry)
+                    await asyncio.sleep(FIRMWARE_REQUEST_SPACING)
+                else:
+                    # queued before the cache was read, which answers it
+                    self._async_notify(serial)
+            except Exception:  # pylint: disable=broad-except
+                # one bad lookup must not stop the lookups of every device
+                _LOGGER.exception("Firmware lookup of %s failed", serial)
+            finally:
+                self._queued.discard(serial)
+
+    async def _async_check(self, serial: str, entry: dict | None) -> None:
+        """Query the latest versions of one serial number."""
+        session = async_get_clientsession(self._hass)
+        try:
+            async with session.get(
+                self.url,
+                params={"sn": serial},
+                timeout=aiohttp.ClientTimeout(total=FIRMWARE_TIMEOUT),
+            ) as response:
+                response.raise_for_status()
+                info = json_loads(await response.read())
+                if not isinstance(info, dict):
+                    raise ValueError(f"unexpected answer {info!r}")
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as error:
+            _LOGGER.debug("Firmware lookup of %s failed: %s", serial, error)
+            # keep the last result, but don't ask again right away
+            self._cache[serial] = {
+                "expires": time.time() + FIRMWARE_RETRY,
+                "result": entry["result"] if entry is not None else None,
+            }
+        else:
+            _LOGGER.debug(info)
+            self._cache[serial] = {
+                "expires": time.time() + FIRMWARE_TTL,
+                "result": {
+                    FIRMWARE_KEYS.get(key, key): value for key, value in info.items()
+                },
+            }
+        self._store.async_delay_save(lambda: self._cache, FIRMWARE_SAVE_DELAY)
+        self._async_notify(serial)
+
+    @callback
+    def _async_notify(self, serial: str) -> None:
+        """Call the listeners of a serial number."""
+        for update_callback in list(self._listeners.get(serial, ())):
+            update_callback()
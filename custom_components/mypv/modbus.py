@@ -0,0 +1,125 @@
+"""Modbus TCP transport for the live values of a MYPV device."""
+
+import asyncio
+import logging
+import struct
+
+from .const import (
+    MODBUS_REGISTERS,
+    MODBUS_SIGNED_REGISTERS,
+    MODBUS_MAX_BLOCK,
+    MODBUS_MAX_GAP,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+READ_HOLDING_REGISTERS = 0x03
+
+
+class ModbusError(Exception):
+    """Error raised for a failed Modbus request."""
+
+
+def build_blocks(registers: dict) -> list:
+    """Group the register addresses into contiguous read blocks.
+
+    Addresses closer than MODBUS_MAX_GAP are read in one request, returns a
+    list of (start address, register count).
+    """
+    blocks = []
+    for address in sorted(set(registers.values())):
+        if blocks:
+            start, count = blocks[-1]
+            end = start + count
+            if address - end <= MODBUS_MAX_GAP and address - start < MODBUS_MAX_BLOCK:
+                blocks[-1] = (start, address - start + 1)
+                continue
+        blocks.append((address, 1))
+    return blocks
+
+
+class MypvModbus:
+    """Read the live values of a device with batched register reads."""
+
+    def __init__(
+        self, host: str, port: int = 502, unit_id: int = 1, registers: dict = None
+    ) -> None:
+        """Initialize the client."""
+        self.host = host
+        self.port = port
+        self.unit_id = unit_id
+        self._registers = registers or MODBUS_REGISTERS
+        self._blocks = build_blocks(self._registers)
+        self._reader = None
+        self._writer = None
+        self._transaction = 0
+        self._lock = asyncio.Lock()
+
+    async def _async_connect(self) -> None:
+        """Open the connection if it isn't open yet."""
+        if self._writer is not None and not self._writer.is_closing():
+            return
+        self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+
+    async def async_read_registers(self, address: int, count: int) -> tuple:
+        """Read a block of holding registers."""
+        async with self._lock:
+            self._transaction = (self._transaction + 1) & 0xFFFF
+            request = struct.pack(
+                ">HHHBBHH",
+                self._transaction,
+                0,
+                6,
+                self.unit_id,
+                READ_HOLDING_REGISTERS,
+                address,
+                count,
+            )
+            try:
+                await self._async_connect()
+                self._writer.write(request)
+                await self._writer.drain()
+                header = await self._reader.readexactly(7)
+                transaction, _, length, _ = struct.unpack(">HHHB", header)
+                pdu = await self._reader.readexactly(length - 1)
+            except (OSError, asyncio.IncompleteReadError) as error:
+                await self.async_close()
+                raise ModbusError(
+                    f"Connection to {self.host} failed: {error}"
+                ) from error
+            except asyncio.CancelledError:
+                # the late response would answer the next request
+                await self.async_close()
+                raise
+            if transaction != self._transaction:
+                await self.async_close()
+                raise ModbusError(
+                    f"Unexpected transaction {transaction} from {self.host}"
+                )
+
+        if pdu[0] != READ_HOLDING_REGISTERS:
+            raise ModbusError(f"Exception {pdu[1]} reading register {address}")
+        if pdu[1] != count * 2:
+            raise ModbusError(f"Short response reading register {address}")
+        return struct.unpack(f">{count}H", pdu[2:])
+
+    async def async_read_data(self) -> dict:
+        """Read all mapped registers, keyed like data.jsn."""
+        values = {}
+        for start, count in self._blocks:
+            registers = await self.async_read_registers(start, count)
+            for address, value in enumerate(registers, start):
+                values[address] = value
+        data = {key: values[address] for key, address in self._registers.items()}
+        for key in MODBUS_SIGNED_REGISTERS.intersection(data):
+            if data[key] & 0x8000:
+                data[key] -= 0x10000
+        _LOGGER.debug(data)
+        return data
+
+    async def async_close(self) -> None:
+        """Close the connection."""
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+            self._reader = None
@@ -0,0 +1,112 @@
+"""Fleet wide poll scheduling for MYPV devices."""
+
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import timedelta
+import logging
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DOMAIN, DATA_SCHEDULER, FLEET_MAX_IN_FLIGHT
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@callback
+def async_get_scheduler(hass: HomeAssistant) -> "MypvFleetScheduler":
+    """Return the scheduler shared by all config entries."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if DATA_SCHEDULER not in domain_data:
+        domain_data[DATA_SCHEDULER] = MypvFleetScheduler(hass, FLEET_MAX_IN_FLIGHT)
+    return domain_data[DATA_SCHEDULER]
+
+
+class MypvFleetScheduler:
+    """Spread the polls of all devices and cap the requests in flight.
+
+    The devices poll at evenly spaced offsets within their interval, in the
+    order of their serial numbers, so a fleet on the same interval doesn't
+    fire in bursts.
+    """
+
+    def __init__(self, hass: HomeAssistant, max_in_flight: int) -> None:
+        """Initialize the scheduler."""
+        self._hass = hass
+        self._semaphore = asyncio.Semaphore(max_in_flight)
+        self.max_in_flight = max_in_flight
+        # serial numbers of the polling devices, sorted
+        self._keys = []
+        self.queue_depth = 0
+        self.stats = {
+            "polls": 0,
+            "max_queue_depth": 0,
+            "last_lateness": 0.0,
+            "max_lateness": 0.0,
+            "total_lateness": 0.0,
+        }
+
+    def phase(self, key: str, interval: float) -> float:
+        """Return the offset of a device within the interval in seconds."""
+        if key not in self._keys:
+            self._keys.append(key)
+            self._keys.sort()
+        return self._keys.index(key) / len(self._keys) * interval
+
+    @callback
+    def async_remove(self, key: str) -> None:
+        """Free the slot of a device which stopped polling."""
+        if key in self._keys:
+            self._keys.remove(key)
+
+    async def async_wait_for_slot(self, key: str, interval: timedelta) -> None:
+        """Wait for the next poll slot of a device.
+
+        A poll which is at most half an interval behind its slot runs at once
+        and is accounted as late, an earlier one sleeps until its slot.
+        """
+        seconds = interval.total_seconds()
+        now = self._hass.loop.time()
+        if seconds <= 0:
+            # without an interval there is no slot to wait for
+            lateness = 0.0
+        else:
+            lateness = (now - self.phase(key, seconds)) % seconds
+        if lateness > seconds / 2:
+            _LOGGER.debug("Delaying poll of %s by %.2f s", key, seconds - lateness)
+            await asyncio.sleep(seconds - lateness)
+            lateness = 0.0
+
+        stats = self.stats
+        stats["polls"] += 1
+        stats["last_lateness"] = lateness
+        stats["max_lateness"] = max(stats["max_lateness"], lateness)
+        stats["total_lateness"] += lateness
+
+    @asynccontextmanager
+    async def async_request(self):
+        """Hold one of the fleet wide request slots."""
+        self.queue_depth += 1
+        self.stats["max_queue_depth"] = max(
+            self.stats["max_queue_depth"], self.queue_depth
+        )
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.queue_depth -= 1
+        try:
+            yield
+        finally:
+            self._semaphore.release()
+
+    @property
+    def diagnostics(self) -> dict:
+        """Return the queue and lateness metrics."""
+        stats = self.stats
+        return {
+            **stats,
+            "max_in_flight": self.max_in_flight,
+            "queue_depth": self.queue_depth,
+            "mean_lateness": (
+                stats["total_lateness"] / stats["polls"] if stats["polls"] else None
+            ),
+        }
@@ -1,33 +1,42 @@
 """The MYPV integration."""
 
 import logging
-from homeassistant.const import CONF_MONITORED_CONDITIONS
+from homeassistant.core import callback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
-from homeassistant.helpers.entity import DeviceInfo
-from homeassistant.util import slugify
 from homeassistant.components.sensor import (
     SensorEntity,
-    SensorStateClass,
     SensorDeviceClass,
 )
-from homeassistant.const import (
-    ELECTRIC_CURRENT_AMPERE,
-    FREQUENCY_HERTZ,
-    TEMP_CELSIUS,
-)
 
-from .const import SENSOR_TYPES, DOMAIN, DATA_COORDINATOR, MYPV_DEVICES
-from .coordinator import MYPVDataUpdateCoordinator
-from .trans import my_pv_trans
+from .const import (
+    SENSOR_TYPES,
+    DOMAIN,
+    DATA_COORDINATOR,
+    DATA_DEVICE,
+    MYPV_DEVICES,
+    MypvSensorEntityDescription,
+)
+from .convert import (
+    enum_states,
+    enum_translation_key,
+    load_catalogue,
+    state_converter,
+)
+from .coordinator import (
+    MYPVDataUpdateCoordinator,
+    MypvDeviceInfo,
+    async_track_new_sensors,
+    available_sensors,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
 
 async def async_setup_entry(hass, entry, async_add_entities):
     """Add an MYPV entry."""
-    coordinator: MYPVDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id][
-        DATA_COORDINATOR
-    ]
+    entry_data = hass.data[DOMAIN][entry.entry_id]
+    coordinator: MYPVDataUpdateCoordinator = entry_data[DATA_COORDINATOR]
+    device: MypvDeviceInfo = entry_data[DATA_DEVICE]
 
     if (
         "polling_interval" in entry.options
@@ -35,130 +44,101 @@ async def async_setup_entry(hass, entry, async_add_entities):
     ):
         coordinator.set_interval(entry.options["polling_interval"])
 
-    entities = []
-
-    if "use_all_sensors" in entry.options and entry.options["use_all_sensors"]:
-        for sensor in SENSOR_TYPES:
-            entities.append(MypvDevice(coordinator, sensor, entry.title))
-    elif CONF_MONITORED_CONDITIONS in entry.options:
-        for sensor in entry.options[CONF_MONITORED_CONDITIONS]:
-            entities.append(MypvDevice(coordinator, sensor, entry.title))
-    else:
-        for sensor in entry.data[CONF_MONITORED_CONDITIONS]:
-            entities.append(MypvDevice(coordinator, sensor, entry.title))
-    async_add_entities(entities)
+    # the state texts are read from disk once, by the first entry
+    await hass.async_add_executor_job(load_catalogue)
+
+    # all sensors only creates the ones the device sends a value for
+    sensors = available_sensors(device, entry.data, entry.options)
+    async_add_entities(MypvDevice(device, sensor, entry.title) for sensor in sensors)
+
+    if entry.options.get("use_all_sensors"):
+        # values a firmware update added get their sensor without a reload
+        entry.async_on_unload(
+            async_track_new_sensors(
+                device,
+                SENSOR_TYPES.keys() - set(sensors),
+                lambda found: async_add_entities(
+                    MypvDevice(device, sensor, entry.title) for sensor in found
+                ),
+            )
+        )
 
 
 class MypvDevice(CoordinatorEntity, SensorEntity):
     """Representation of a MYPV device."""
 
-    def __init__(self, coordinator, sensor_type, name):
+    entity_description: MypvSensorEntityDescription
+
+    def __init__(self, device, sensor_type, name):
         """Initialize the sensor."""
-        super().__init__(coordinator)
         if sensor_type not in SENSOR_TYPES:
             raise KeyError
-        self.coordinator = coordinator
-        self._sensor = SENSOR_TYPES[sensor_type].name_long
-        self._name = name
+        description = SENSOR_TYPES[sensor_type]
+        # only wake up when one of the keys the state is built from changed
+        super().__init__(
+            device.coordinators[description.source],
+            context=frozenset((sensor_type, *description.depends)),
+        )
+        self.entity_description = description
         self.type = sensor_type
-        self._data_source = SENSOR_TYPES[sensor_type].source
-        self._last_value = None
-        self._unit_of_measurement = SENSOR_TYPES[self.type].unit
-        self._icon = SENSOR_TYPES[self.type].icon
-
-        self.serial_number = self.coordinator.data["info"]["sn"]
-        self.fwversion = self.coordinator.data["info"]["fwversion"]
-        self.model = self.coordinator.data["info"]["device"]
-        _LOGGER.debug(self.coordinator)
-
-    @property
-    def name(self):
-        """Return the name of the sensor."""
-        return f"{self._sensor}"
-
-    @property
-    def unique_id(self):
-        """Return unique id based on device serial and value key."""
-        return "mypv {} {}".format(self.serial_number, self.type)
-
-    # @property
-    # def entity_id(self):
-    #    """entity id"""
-    #    if not self.entity_id:
-    #        return "sensor." + slugify(self.unique_id)
-    #    return None
+        self.model = device.info["device"]
+        self._convert = None
+
+        # static attributes are bound once instead of computed per state write
+        self._attr_name = description.name
+        self._attr_unique_id = f"mypv {device.serial} {sensor_type}"
+        self._attr_icon = description.icon
+        self._attr_native_unit_of_measurement = description.native_unit_of_measurement
+        self._attr_device_class = description.device_class
+        self._attr_state_class = description.state_class
+        self._attr_device_info = device.device_info(name)
+        # status codes are published as enum and translated by the frontend
+        if (states := enum_states(sensor_type, self.model)) is not None:
+            self._attr_device_class = SensorDeviceClass.ENUM
+            self._attr_options = list(states.values())
+            self._attr_translation_key = enum_translation_key(
+                sensor_type, MYPV_DEVICES.get(self.model)
+            )
 
     @property
-    def state(self):
-        """Return the state of the device."""
+    def available(self) -> bool:
+        """Return False while the device doesn't send the value."""
+        data = self.coordinator.data
+        return super().available and (data is None or self.type in data)
+
+    async def async_added_to_hass(self) -> None:
+        """Convert the current value before the first state is written."""
+        # states are translated into the language of the installation, the
+        # converter exists before the first update can arrive
+        self._convert = state_converter(
+            self.type, self.model, self.hass.config.language
+        )
+        await super().async_added_to_hass()
+        if self.coordinator.data is not None:
+            self._update_state()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Convert the new value once, before the state is written."""
+        self._update_state()
+        super()._handle_coordinator_update()
+
+    def _update_state(self) -> None:
+        """Build the state from the page, a missing value keeps the last one."""
+        data = self.coordinator.data
+        if data is None or self.type not in data:
+            # unavailable until the device sends the value again
+            return
         try:
-            state = self.coordinator.data[self._data_source][self.type]
-            if self.type == "power_act":
-                rel_out = int(self.coordinator.data[self._data_source]["rel1_out"])
-                load_nom = int(self.coordinator.data[self._data_source]["load_nom"])
-                state = (rel_out * load_nom) + int(state)
-            self._last_value = state
-        except Exception as ex:
+            value = self._convert(data)
+        except (KeyError, TypeError, ValueError) as ex:
             _LOGGER.error(ex)
-            state = self._last_value
-        if state is None:
-            return state
-        if self._unit_of_measurement == FREQUENCY_HERTZ:
-            return state / 1000
-        if self._unit_of_measurement == TEMP_CELSIUS and self.type != "tempchip":
-            return state / 10
-        if self._unit_of_measurement == ELECTRIC_CURRENT_AMPERE:
-            return state / 10
-        trans_key = f"info_{self.type}_{str(state)}"
-        if "status" == self.type:
-            trans_key = f"info_state_{MYPV_DEVICES[self.model]}_{str(state)}"
-        elif self.type in ["m1devstate", "m2devstate", "m3devstate", "m4devstate"]:
-            if state & 1:
-                trans_key = "info_measure_devstate_err1"
-            elif state & 2:
-                trans_key = "info_measure_devstate_err2"
-            elif state & 4:
-                trans_key = "info_measure_devstate_err3"
-            elif state & 8:
-                trans_key = "info_measure_devstate_err4"
-            else:
-                return state
-        if trans_key in my_pv_trans:
-            return str(state) + my_pv_trans[trans_key][0]  # 0 = deutsch
-        return state
-
-    @property
-    def state_class(self):
-        """state class"""
-        if self.type == "power":
-            return SensorStateClass.MEASUREMENT
-        return None
-
-    @property
-    def device_class(self):
-        """state class"""
-        if self.type == "power":
-            return SensorDeviceClass.POWER
-        return None
-
-    @property
-    def native_unit_of_measurement(self):
-        """Return the unit of measurement this sensor expresses itself in."""
-        return self._unit_of_measurement
-
-    @property
-    def icon(self):
-        """Return icon."""
-        return self._icon
-
-    @property
-    def device_info(self):
-        """Return information about the device."""
-        return DeviceInfo(
-            identifiers={(DOMAIN, self.serial_number)},
-            manufacturer="MYPV",
-            model=self.model,
-            name=self._name,
-            sw_version=self.fwversion,
-            hw_version=None,
-        )
+            return
+        if (
+            value is not None
+            and (options := self.options) is not None
+            and value not in options
+        ):
+            # an unknown status code becomes an option instead of being dropped
+            self._attr_options = [*options, value]
+        self._attr_native_value = value
@@ -0,0 +1,121 @@
+"""Extract the state texts of the sensors from trans.py.
+
+trans.py is the translation table of the my-PV web setup. Only the info_*
+namespaces the sensors translate their states with are written to
+custom_components/mypv/catalogue.json, which the integration loads at
+runtime instead of importing trans.py. The texts of the enum sensors are
+written to the entity section of translations/<language>.json, where the
+frontend translates them. Run from the repository root after updating
+trans.py or the sensor types:
+
+    python scripts/build_catalogue.py
+    python scripts/build_catalogue.py --check
+"""
+
+import argparse
+import json
+import os
+import sys
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+sys.path.insert(0, ROOT)
+
+from custom_components.mypv.const import (  # noqa: E402
+    ENUM_SENSORS,
+    MYPV_DEVICES,
+    SENSOR_TYPES,
+)
+from custom_components.mypv.convert import (  # noqa: E402
+    enum_texts,
+    enum_translation_key,
+)
+from custom_components.mypv.trans import my_pv_trans  # noqa: E402
+
+COMPONENT = os.path.normpath(os.path.join(ROOT, "custom_components", "mypv"))
+CATALOGUE = os.path.join(COMPONENT, "catalogue.json")
+TRANSLATIONS = os.path.join(COMPONENT, "translations")
+
+
+def dumps(value) -> str:
+    """Return value as compact JSON."""
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+def build_catalogue() -> dict:
+    """Return the texts of the namespaces the sensors use."""
+    prefixes = (
+        *(f"info_state_{model}_" for model in MYPV_DEVICES.values()),
+        *(f"info_{sensor_type}_" for sensor_type in SENSOR_TYPES),
+        "info_measure_devstate_err",
+    )
+    return {
+        key: value for key, value in my_pv_trans.items() if key.startswith(prefixes)
+    }
+
+
+def build_entities(texts: dict, index: int) -> dict:
+    """Return the entity translations of the enum sensors in one language."""
+    sensors = {}
+    for sensor_type, (prefix, _) in ENUM_SENSORS.items():
+        models = MYPV_DEVICES.values() if "{model}" in prefix else (None,)
+        for short_model in models:
+            codes = enum_texts(texts, sensor_type, short_model)
+            if not codes:
+                continue
+            sensors[enum_translation_key(sensor_type, short_model)] = {
+                "state": {
+                    str(code): codes[code][index].removeprefix(",").strip()
+                    for code in sorted(codes)
+                }
+            }
+    return {"sensor": sensors}
+
+
+def build() -> dict:
+    """Return the content of every generated file, keyed by path."""
+    texts = build_catalogue()
+    languages = my_pv_trans["language_code"]
+    lines = ",\n".join(f"{dumps(key)}:{dumps(value)}" for key, value in texts.items())
+    files = {
+        CATALOGUE: (f'{{"languages":{dumps(languages)},"texts":{{\n{lines}\n}}}}\n')
+    }
+    for index, language in enumerate(languages):
+        path = os.path.join(TRANSLATIONS, f"{language}.json")
+        translations = {}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as file:
+                translations = json.load(file)
+        translations["entity"] = build_entities(texts, index)
+        files[path] = json.dumps(translations, ensure_ascii=False, indent=2) + "\n"
+    return files
+
+
+def main() -> int:
+    """Write the generated files, or check that they are up to date."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--check", action="store_true", help="fail if a generated file is outdated"
+    )
+    args = parser.parse_args()
+    outdated = []
+    for path, content in build().items():
+        current = None
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as file:
+                current = file.read()
+        if current == content:
+            continue
+        outdated.append(path)
+        if not args.check:
+            with open(path, "w", encoding="utf-8") as file:
+                file.write(content)
+    if args.check and outdated:
+        print(f"Outdated: {', '.join(outdated)}, run scripts/build_catalogue.py")
+        return 1
+    for path in outdated:
+        print(f"Wrote {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,122 @@
+"""Tests of the Modbus TCP transport against a stand-in server."""
+
+import asyncio
+import struct
+
+import pytest
+
+from custom_components.mypv.modbus import ModbusError, MypvModbus
+
+# the stand-in server listens on localhost
+pytestmark = pytest.mark.usefixtures("socket_enabled")
+
+REGISTERS = {"power": 1000, "temp1": 1001, "power_grid_act": 1075}
+
+
+class StandInServer:
+    """Answer read holding registers requests from a register table."""
+
+    def __init__(self, registers: dict) -> None:
+        """Initialize the server."""
+        self.registers = registers
+        # seconds the responses to the next requests are late
+        self.delays = []
+        self.connections = 0
+        self._server = None
+
+    async def __aenter__(self) -> "StandInServer":
+        """Listen on a free port of localhost."""
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        """Stop listening."""
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handle(self, reader, writer) -> None:
+        """Answer the requests of one connection."""
+        self.connections += 1
+        try:
+            while True:
+                request = await reader.readexactly(12)
+                transaction, _, _, unit_id, function, address, count = struct.unpack(
+                    ">HHHBBHH", request
+                )
+                if self.delays:
+                    await asyncio.sleep(self.delays.pop(0))
+                if function != 3 or address not in self.registers:
+                    pdu = struct.pack(">BB", function | 0x80, 2)
+                else:
+                    values = [
+                        self.registers.get(register, 0)
+                        for register in range(address, address + count)
+                    ]
+                    pdu = struct.pack(f">BB{count}H", function, count * 2, *values)
+                header = struct.pack(">HHHB", transaction, 0, len(pdu) + 1, unit_id)
+                writer.write(header + pdu)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+def test_read_data() -> None:
+    """The registers are read in blocks and keyed like data.jsn."""
+
+    async def run() -> None:
+        async with StandInServer(
+            {1000: 1500, 1001: 453, 1075: 0x10000 - 1200}
+        ) as server:
+            client = MypvModbus("127.0.0.1", server.port, registers=REGISTERS)
+            data = await client.async_read_data()
+            await client.async_close()
+        assert data == {"power": 1500, "temp1": 453, "power_grid_act": -1200}
+
+    asyncio.run(run())
+
+
+def test_recovers_after_timeout() -> None:
+    """A late response doesn't answer the requests after the timeout."""
+
+    async def run() -> None:
+        async with StandInServer({1000: 1500}) as server:
+            client = MypvModbus("127.0.0.1", server.port)
+            server.delays = [0.5]
+            with pytest.raises(asyncio.TimeoutError):
+                async with asyncio.timeout(0.1):
+                    await client.async_read_registers(1000, 1)
+            for _ in range(3):
+                assert await client.async_read_registers(1000, 1) == (1500,)
+            await client.async_close()
+        assert server.connections == 2
+
+    asyncio.run(run())
+
+
+def test_exception_response() -> None:
+    """A Modbus exception raises ModbusError."""
+
+    async def run() -> None:
+        async with StandInServer({1000: 1500}) as server:
+            client = MypvModbus("127.0.0.1", server.port)
+            with pytest.raises(ModbusError):
+                await client.async_read_registers(2000, 1)
+            await client.async_close()
+
+    asyncio.run(run())
+
+
+def test_connection_refused() -> None:
+    """A refused connection raises ModbusError."""
+
+    async def run() -> None:
+        async with StandInServer({}) as server:
+            port = server.port
+        client = MypvModbus("127.0.0.1", port)
+        with pytest.raises(ModbusError):
+            await client.async_read_registers(1000, 1)
+
+    asyncio.run(run())